@@ -1,6 +1,8 @@
 import os
 import time
 
+from mazemap import MazeMap
+
 DIR   = ["N", "E", "S", "W"]
 DELTA = {"N": (-1, 0), "E": (0, 1), "S": (1, 0), "W": (0, -1)}
     
@@ -8,7 +10,7 @@ class ExplorationRobot:
     DIR   = ["N", "E", "S", "W"]
     DELTA = {"N": (-1, 0), "E": (0, 1), "S": (1, 0), "W": (0, -1)}
 
-    def __init__(self, start_pos, goal_pos, board_size):
+    def __init__(self, start_pos, goal_pos, board_size, cell_based=False):
         self.curr_pos   = start_pos
         self.start_pos  = start_pos
         self.goal_pos   = goal_pos
@@ -19,18 +21,11 @@ class ExplorationRobot:
         self.turns = 0
         self.command_string = ""              
        
-       #Creates the internal board size
+       #Everything learnt about the maze: wall bits, visited and known
+       #flags per cell, with the outer border already closed
         rows, cols = board_size
-        self.maze    = [["*"] * cols for _ in range(rows)]
-        self.visited = [[False] * cols for _ in range(rows)]
-
-        #sets the maze
-        for i in range(rows):
-            self.maze[i][0]      = "1"
-            self.maze[i][cols-1] = "1"
-        for j in range(cols):
-            self.maze[0][j]      = "1"
-            self.maze[rows-1][j] = "1"
+        self.cell_based = cell_based
+        self.map        = MazeMap(rows, cols, cell_based)
 
         #Create stack
         self.stack = []
@@ -38,67 +33,89 @@ class ExplorationRobot:
 
         self._gen = None
 
+        #optional TraceRecorder, fed every turn and successful move
+        self.trace = None
+
     #Check the wall with the given board on all sides
     def front_wall(self, board):
-        dr, dc = self.DELTA[self.DIR[self.direction]]
-        r, c   = self.curr_pos
-        return board.is_wall((r + dr, c + dc))
+        return not board.can_move(self.curr_pos, self.direction)
 
     def left_wall(self, board):
         d = (self.direction - 1) % 4
-        dr, dc = self.DELTA[self.DIR[d]]
-        r, c   = self.curr_pos
-        return board.is_wall((r + dr, c + dc))
+        return not board.can_move(self.curr_pos, d)
 
     def right_wall(self, board):
         d = (self.direction + 1) % 4
-        dr, dc = self.DELTA[self.DIR[d]]
-        r, c   = self.curr_pos
-        #Is_wall acts as the sensor
-        return board.is_wall((r + dr, c + dc))
+        #can_move acts as the sensor
+        return not board.can_move(self.curr_pos, d)
 
     def move_forward(self, board):
-        dr, dc = self.DELTA[self.DIR[self.direction]]
-        r, c   = self.curr_pos
-        nr, nc = r + dr, c + dc
-        if not board.is_wall((nr, nc)):
-            self.curr_pos = (nr, nc)
+        if board.can_move(self.curr_pos, self.direction):
+            dr, dc = self.DELTA[self.DIR[self.direction]]
+            r, c   = self.curr_pos
+            self.curr_pos = (r + dr, c + dc)
             self.steps += 1
+            if self.trace is not None:
+                self.trace.record(b"F", self)
             
     def turn_right_action(self):
         self.direction = (self.direction + 1) % 4
         self.turns += 1
+        if self.trace is not None:
+            self.trace.record(b"R", self)
 
     def turn_left_action(self):
         self.direction = (self.direction - 1) % 4
         self.turns += 1
+        if self.trace is not None:
+            self.trace.record(b"L", self)
+
+    def sense(self, board):
+        #(front, left, right) walls from one read of the board's open mask,
+        #the emulated getWalls(): rotate so bit 0 is ahead, 1 right, 3 left
+        m = board.open_mask(self.curr_pos)
+        rel = (m | m << 4) >> self.direction
+        return not rel & 1, not rel & 8, not rel & 2
 
     def detect_walls(self, board):
+        front, left, right = self.sense(board)
+        self.map.mark_known(*self.curr_pos)
+        if front:
+            self.mark_wall(self.direction)
+        if left:
+            self.mark_wall((self.direction - 1) % 4)
+        if right:
+            self.mark_wall((self.direction + 1) % 4)
+
+    def mark_wall(self, d):
+        #Record a wall seen from the current cell in direction d
         r, c = self.curr_pos
+        self.map.set_wall(r, c, d)
 
-        if self.front_wall(board):
-            dr, dc = self.DELTA[self.DIR[self.direction]]
-            nr, nc = r + dr, c + dc
-            rows, cols = self.board_size
-            if 0 <= nr < rows and 0 <= nc < cols:
-                self.maze[nr][nc] = "1"
-        left_d = (self.direction - 1) % 4
-        
-        
-        if self.left_wall(board):
-            dr, dc = self.DELTA[self.DIR[left_d]]
-            nr, nc = r + dr, c + dc
-            rows, cols = self.board_size
-            if 0 <= nr < rows and 0 <= nc < cols:
-                self.maze[nr][nc] = "1"
-        right_d = (self.direction + 1) % 4
-        
-        if self.right_wall(board):
-            dr, dc = self.DELTA[self.DIR[right_d]]
+    def sensed_cells(self):
+        #Cells whose neighbourhood the last detect_walls could have changed:
+        #the current cell, the cells next to it and, where a neighbour is a
+        #wall square, that square's neighbours. Wall squares are left out.
+        r, c = self.curr_pos
+        rows, cols = self.board_size
+        cells = [(r, c)]
+        for d in range(4):
+            dr, dc = self.DELTA[self.DIR[d]]
             nr, nc = r + dr, c + dc
-            rows, cols = self.board_size
-            if 0 <= nr < rows and 0 <= nc < cols:
-                self.maze[nr][nc] = "1"
+            if not (0 <= nr < rows and 0 <= nc < cols):
+                continue
+            if not self.map.is_solid(nr, nc):
+                cells.append((nr, nc))
+                continue
+            for dd in range(4):
+                ddr, ddc = self.DELTA[self.DIR[dd]]
+                if 0 <= nr + ddr < rows and 0 <= nc + ddc < cols:
+                    cells.append((nr + ddr, nc + ddc))
+        return [(i, j) for i, j in cells if not self.map.is_solid(i, j)]
+
+    def is_blocked(self, r, c, d):
+        #True if the map already rules out moving from (r, c) in direction d
+        return self.map.is_blocked(r, c, d)
 
     def print_discovered_maze(self):
         r, c = self.curr_pos
@@ -112,9 +129,9 @@ class ExplorationRobot:
                     row_str += self.DIR[self.direction][0]   # show heading
                 elif (i, j) == (gr, gc):
                     row_str += "G"
-                elif self.maze[i][j] == "1":
+                elif self.map.is_solid(i, j):
                     row_str += "1"
-                elif self.maze[i][j] == "V":
+                elif self.map.is_visited(i, j):
                     row_str += "·"
                 else:
                     row_str += " "
@@ -141,9 +158,7 @@ class ExplorationDriver:
         call_stack = []  
 
         def _mark_visited():
-            r, c = robot.curr_pos
-            robot.visited[r][c] = True
-            robot.maze[r][c]    = "V"
+            robot.map.visit(*robot.curr_pos)
 
         def _detect():
             robot.detect_walls(board)
@@ -173,15 +188,11 @@ class ExplorationDriver:
 
             dr, dc = DELTA[DIR[new_dir]]
             nr, nc = fr + dr, fc + dc
-            rows, cols = robot.board_size
-
-            if not (0 <= nr < rows and 0 <= nc < cols):
-                continue
 
-            if robot.maze[nr][nc] == "1":
+            if robot.is_blocked(fr, fc, new_dir):
                 continue
 
-            if robot.visited[nr][nc]:
+            if robot.map.is_visited(nr, nc):
                 continue
 
             yield from self._turn_toward(robot, board, nr, nc)
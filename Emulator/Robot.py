@@ -1,5 +1,10 @@
 from Emulator import *
+from emulator import Result
+from motion import DIAGONAL_CELL, compile_commands, split_time
 import heapq
+import itertools
+import sys
+from collections import OrderedDict
 
 
 # ---------------------------------------------------------------------------
@@ -10,10 +15,7 @@ def heuristic(a, b):
     return abs(a[0] - b[0]) + abs(a[1] - b[1])
 
 
-def astar(grid, start, goal):
-    rows = len(grid)
-    cols = len(grid[0])
-
+def astar(board, start, goal):
     frontier = []
     heapq.heappush(frontier, (0, start))
 
@@ -30,21 +32,261 @@ def astar(grid, start, goal):
                 current = came_from[current]
             return list(reversed(path))
 
-        r, c = current
-        for dr, dc in [(-1, 0), (0, 1), (1, 0), (0, -1)]:
-            nr, nc = r + dr, c + dc
-            if 0 <= nr < rows and 0 <= nc < cols:
-                if grid[nr][nc] != 1:
-                    new_cost = cost_so_far[current] + 1
-                    if (nr, nc) not in cost_so_far or new_cost < cost_so_far[(nr, nc)]:
-                        cost_so_far[(nr, nc)] = new_cost
-                        priority = new_cost + heuristic((nr, nc), goal)
-                        heapq.heappush(frontier, (priority, (nr, nc)))
-                        came_from[(nr, nc)] = current
+        # board.neighbours works on both the ASCII Board and a CellBoard
+        for nxt in board.neighbours(current):
+            new_cost = cost_so_far[current] + 1
+            if nxt not in cost_so_far or new_cost < cost_so_far[nxt]:
+                cost_so_far[nxt] = new_cost
+                priority = new_cost + heuristic(nxt, goal)
+                heapq.heappush(frontier, (priority, nxt))
+                came_from[nxt] = current
+
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Time-optimal planning
+#
+# astar() minimises cells, but a turn costs twice a step on the real robot.
+# fastest_path() searches over (cell, heading) instead and prices every edge
+# with a cost model, so it returns the command string with the lowest
+# estimated run time rather than the fewest squares. motion.MotionProfile is
+# a drop-in cost model that makes long straights cheaper per cell.
+# ---------------------------------------------------------------------------
+
+HEADINGS = [(-1, 0), (0, 1), (1, 0), (0, -1)]     # N, E, S, W
+
+
+class CostModel:
+    # Seconds per action; the defaults price moves exactly as Result does
+    def __init__(self, step_time=None, turn_time=None):
+        self.step_time = Result.STEP_TIME if step_time is None else step_time
+        self.turn_time = Result.TURN_TIME if turn_time is None else turn_time
+
+    def straight(self, n):
+        return n * self.step_time
+
+    def diagonal(self, n):
+        return n * self.step_time * DIAGONAL_CELL
+
+    def turn(self):
+        return self.turn_time
+
+    def turn180(self):
+        return 2 * self.turn_time
+
+    def turn45(self):
+        return self.turn_time / 2
+
+    def lower_bound(self, cells):
+        # Never more than the real cost of covering that many cells
+        return cells * self.step_time
+
+    def key(self):
+        return ("linear", self.step_time, self.turn_time)
+
+
+def fastest_path(board, start, heading, goal, cost=None):
+    cost = cost or CostModel()
+
+    # State: (cell, heading, just_moved). Straights are expanded as whole
+    # runs, and a run must be followed by a turn, so a straight is always
+    # priced as one piece by cost.straight(n).
+    start_state = (start, heading, False)
+    tie         = itertools.count()
+    frontier    = [(cost.lower_bound(heuristic(start, goal)), 0.0, next(tie), start_state)]
+    best        = {start_state: 0.0}
+    came_from   = {start_state: (None, "")}
+
+    def push(state, g, prev, cmd):
+        if state not in best or g < best[state]:
+            best[state]      = g
+            came_from[state] = (prev, cmd)
+            f = g + cost.lower_bound(heuristic(state[0], goal))
+            heapq.heappush(frontier, (f, g, next(tie), state))
+
+    while frontier:
+        _, g, _, state = heapq.heappop(frontier)
+        if g > best[state]:
+            continue
+
+        pos, h, moved = state
+        if pos == goal:
+            commands = []
+            while state is not None:
+                state, cmd = came_from[state]
+                commands.append(cmd)
+            return "".join(reversed(commands))
+
+        push((pos, (h + 1) % 4, False), g + cost.turn(), state, "R")
+        push((pos, (h - 1) % 4, False), g + cost.turn(), state, "L")
+        if cost.turn180() < 2 * cost.turn():
+            push((pos, (h + 2) % 4, False), g + cost.turn180(), state, "RR")
+
+        if not moved:
+            dr, dc = HEADINGS[h]
+            r, c   = pos
+            n      = 0
+            while board.can_move((r, c), h):
+                r, c = r + dr, c + dc
+                n   += 1
+                push(((r, c), h, True), g + cost.straight(n), state, "F" * n)
 
     return None
 
 
+# ---------------------------------------------------------------------------
+# Diagonal speed runs
+#
+# A staircase (three or more moves alternating between two perpendicular
+# directions) can be driven as one 45-degree line through the cell corners
+# instead of a 90-degree turn in every cell. Speed-run commands add:
+#   r / l  45-degree turn right / left, into or out of a diagonal
+#   D      one cell of the staircase, crossed diagonally
+# diagonal_path() takes the cells of the shortest and the fastest path,
+# replaces each staircase with a diagonal where the cost model says it is
+# quicker, and keeps whichever result is cheaper. Robot checks every D
+# against the wall it crosses, exactly like F.
+# ---------------------------------------------------------------------------
+
+def _turns(h, target):
+    return ("", "R", "RR", "L")[(target - h) % 4]
+
+
+def _command_moves(commands, heading):
+    # Cell-by-cell headings of an orthogonal command string
+    moves = []
+    for cmd in commands:
+        if cmd == "F":
+            moves.append(heading)
+        elif cmd == "R":
+            heading = (heading + 1) % 4
+        elif cmd == "L":
+            heading = (heading - 1) % 4
+    return moves
+
+
+def _staircases(moves):
+    # Maximal (first, last) index ranges of alternating perpendicular moves
+    runs, i, n = [], 0, len(moves)
+    while i < n:
+        j = i
+        while (j + 1 < n and (moves[j + 1] - moves[j]) % 2
+               and (j == i or moves[j + 1] == moves[j - 1])):
+            j += 1
+        if j - i >= 2:
+            runs.append((i, j))
+        i = max(j, i + 1)
+    return runs
+
+
+def _render(moves, heading, diagonals):
+    out    = []
+    ends   = dict(diagonals)
+    i      = 0
+    while i < len(moves):
+        if i in ends:
+            j    = ends[i]
+            a, b = moves[i], moves[i + 1]
+            out += [_turns(heading, a), "r" if b == (a + 1) % 4 else "l", "D" * (j - i + 1)]
+            # Out of the diagonal onto the last staircase direction
+            heading = moves[j]
+            out.append("r" if heading == (moves[j - 1] + 1) % 4 else "l")
+            i = j + 1
+        else:
+            out += [_turns(heading, moves[i]), "F"]
+            heading = moves[i]
+            i += 1
+    return "".join(out)
+
+
+def _price(commands, cost):
+    return sum(split_time(compile_commands(commands), cost))
+
+
+def diagonal_path(board, start, heading, goal, cost=None):
+    cost = cost or CostModel()
+
+    candidates = []
+    path = astar(board, start, goal)
+    if path:
+        candidates.append([HEADINGS.index((b[0] - a[0], b[1] - a[1]))
+                           for a, b in zip(path, path[1:])])
+    commands = fastest_path(board, start, heading, goal, cost)
+    if commands is not None:
+        candidates.append(_command_moves(commands, heading))
+
+    best, best_time = None, None
+    for moves in candidates:
+        chosen = []
+        for run in _staircases(moves):
+            if _price(_render(moves, heading, chosen + [run]), cost) < \
+               _price(_render(moves, heading, chosen), cost):
+                chosen.append(run)
+        commands = _render(moves, heading, chosen)
+        t        = _price(commands, cost)
+        if best is None or t < best_time:
+            best, best_time = commands, t
+    return best
+
+
+# ---------------------------------------------------------------------------
+# Path cache
+#
+# Planned command strings keyed by (board fingerprint, start, goal, heading),
+# shared by every Robot in the process. Bounded both by entry count and by
+# the approximate memory the cached strings and keys take up; the least
+# recently used entries go first.
+# ---------------------------------------------------------------------------
+
+class PathCache:
+    def __init__(self, max_entries=4096, max_bytes=16 << 20):
+        self.max_entries = max_entries
+        self.max_bytes   = max_bytes
+        self._entries    = OrderedDict()
+        self.bytes       = 0
+        self.hits        = 0
+        self.misses      = 0
+        self.evictions   = 0
+
+    @staticmethod
+    def _size(key, commands):
+        return sys.getsizeof(commands) + sys.getsizeof(key) + sys.getsizeof(key[0])
+
+    def get(self, key):
+        commands = self._entries.get(key)
+        if commands is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return commands
+
+    def put(self, key, commands):
+        if key in self._entries:
+            self.bytes -= self._size(key, self._entries.pop(key))
+        self._entries[key] = commands
+        self.bytes += self._size(key, commands)
+        while self._entries and (len(self._entries) > self.max_entries
+                                 or self.bytes > self.max_bytes):
+            old_key, old = self._entries.popitem(last=False)
+            self.bytes -= self._size(old_key, old)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+        self.bytes = 0
+
+    def stats(self):
+        return {
+            "entries":   len(self._entries),
+            "bytes":     self.bytes,
+            "hits":      self.hits,
+            "misses":    self.misses,
+            "evictions": self.evictions,
+        }
+
+
 # ---------------------------------------------------------------------------
 # Robot
 # ---------------------------------------------------------------------------
@@ -53,6 +295,8 @@ class Robot:
     DIR   = ["N", "E", "S", "W"]
     DELTA = {"N": (-1, 0), "E": (0, 1), "S": (1, 0), "W": (0, -1)}
 
+    path_cache = PathCache()   # shared by all robots in the process
+
     def __init__(self, start_pos, goal_pos, board_size):
         self.curr_pos  = start_pos
         self.start_pos = start_pos
@@ -60,20 +304,49 @@ class Robot:
         self.direction = "N"
 
         # movement counters used by Result.timeReport()
-        self.steps = 0   # forward moves
-        self.turns = 0   # 90-degree turns (logged by reactive drivers)
+        self.steps = 0   # forward moves, diagonal cells included
+        self.turns = 0   # 90- and 45-degree turns (logged by reactive drivers)
+
+        # On a diagonal: the other staircase direction (DIR index); direction
+        # is always the orthogonal direction of the next staircase cell
+        self.diag_partner = None
 
         # A* pre-computed command string
         self.command_string = ""
         self.command_index  = 0
         self.board_size     = board_size
 
+        # optional TraceRecorder, fed every turn and successful move
+        self.trace = None
+
     # ------------------------------------------------------------------
     # A* path generation
     # ------------------------------------------------------------------
 
-    def generate_path(self, board):
-        path = astar(board.grid, self.start_pos, self.goal_pos)
+    # planner: "shortest" (fewest cells, astar), "fastest" (lowest
+    # estimated time under cost, fastest_path) or "diagonal" (fastest, with
+    # staircases driven as diagonals, diagonal_path)
+    def generate_path(self, board, planner="shortest", cost=None):
+        key = (board.fingerprint(), self.start_pos, self.goal_pos, self.direction, planner)
+        if planner in ("fastest", "diagonal"):
+            cost = cost or CostModel()
+            key += cost.key()
+
+        commands = self.path_cache.get(key)
+        if commands is None:
+            if planner == "fastest":
+                commands = fastest_path(board, self.start_pos, self.DIR.index(self.direction),
+                                        self.goal_pos, cost) or ""
+            elif planner == "diagonal":
+                commands = diagonal_path(board, self.start_pos, self.DIR.index(self.direction),
+                                         self.goal_pos, cost) or ""
+            else:
+                commands = self._plan_path(board)
+            self.path_cache.put(key, commands)
+        return commands
+
+    def _plan_path(self, board):
+        path = astar(board, self.start_pos, self.goal_pos)
         if not path:
             return ""
 
@@ -100,9 +373,9 @@ class Robot:
 
         return "".join(commands)
 
-    def execute_next(self, board):
+    def execute_next(self, board, planner="shortest", cost=None):
         if not self.command_string:
-            self.command_string = self.generate_path(board)
+            self.command_string = self.generate_path(board, planner, cost)
             self.command_index  = 0
 
         if self.command_index >= len(self.command_string):
@@ -117,6 +390,10 @@ class Robot:
             self.turn_right()
         elif cmd == "L":
             self.turn_left()
+        elif cmd == "D":
+            self.move_diagonal(board)
+        elif cmd in "rl":
+            self.turn_45(cmd)
 
     # ------------------------------------------------------------------
     # Primitive actions
@@ -128,35 +405,72 @@ class Robot:
         return r + dr, c + dc
 
     def move_forward(self, board):
-        next_pos = self._get_next_pos(self.direction)
-        if not board.is_wall(next_pos):
-            self.curr_pos = next_pos
+        if board.can_move(self.curr_pos, self.DIR.index(self.direction)):
+            self.curr_pos = self._get_next_pos(self.direction)
             self.steps   += 1
+            if self.trace is not None:
+                self.trace.record(b"F", self)
 
     def turn_right(self):
         i              = self.DIR.index(self.direction)
         self.direction = self.DIR[(i + 1) % 4]
         self.turns    += 1          # log every 90-degree turn
+        if self.trace is not None:
+            self.trace.record(b"R", self)
 
     def turn_left(self):
         i              = self.DIR.index(self.direction)
         self.direction = self.DIR[(i - 1) % 4]
         self.turns    += 1          # log every 90-degree turn
+        if self.trace is not None:
+            self.trace.record(b"L", self)
+
+    def turn_45(self, cmd):
+        # Into a diagonal: remember the second staircase direction. Out of
+        # one: face the direction of the last staircase cell.
+        i = self.DIR.index(self.direction)
+        if self.diag_partner is None:
+            self.diag_partner = (i + 1) % 4 if cmd == "r" else (i - 1) % 4
+        else:
+            self.direction    = self.DIR[self.diag_partner]
+            self.diag_partner = None
+        self.turns += 1
+        if self.trace is not None:
+            self.trace.record(cmd.encode(), self)
+
+    def move_diagonal(self, board):
+        # One staircase cell; the wall crossed is the same one an F would
+        # cross, so a diagonal through a wall stops the robot just the same
+        i = self.DIR.index(self.direction)
+        if self.diag_partner is not None and board.can_move(self.curr_pos, i):
+            self.curr_pos  = self._get_next_pos(self.direction)
+            self.steps    += 1
+            self.direction, self.diag_partner = self.DIR[self.diag_partner], i
+            if self.trace is not None:
+                self.trace.record(b"D", self)
 
     # ------------------------------------------------------------------
     # Sensing helpers
     # ------------------------------------------------------------------
 
+    def sense(self, board):
+        # (front, left, right) open, like the Romi's single getWalls() call:
+        # one read of the board's open mask, rotated so bit 0 is straight
+        # ahead, bit 1 right and bit 3 left
+        m   = board.open_mask(self.curr_pos)
+        rel = (m | m << 4) >> self.DIR.index(self.direction)
+        return bool(rel & 1), bool(rel & 8), bool(rel & 2)
+
     def can_move_forward(self, board):
-        return not board.is_wall(self._get_next_pos(self.direction))
+        return board.can_move(self.curr_pos, self.DIR.index(self.direction))
 
     def can_move_right(self, board):
         i = (self.DIR.index(self.direction) + 1) % 4
-        return not board.is_wall(self._get_next_pos(self.DIR[i]))
+        return board.can_move(self.curr_pos, i)
 
     def can_move_left(self, board):
         i = (self.DIR.index(self.direction) - 1) % 4
-        return not board.is_wall(self._get_next_pos(self.DIR[i]))
+        return board.can_move(self.curr_pos, i)
 
 
 # ---------------------------------------------------------------------------
@@ -164,5 +478,12 @@ class Robot:
 # ---------------------------------------------------------------------------
 
 class AStarDriver:
+    def __init__(self, planner="shortest", cost=None):
+        self.planner = planner
+        self.cost    = cost
+
+    def state_key(self, robot):
+        return robot.command_index
+
     def step(self, robot, board):
-        robot.execute_next(board)
\ No newline at end of file
+        robot.execute_next(board, self.planner, self.cost)
\ No newline at end of file
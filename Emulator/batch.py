@@ -0,0 +1,292 @@
+import argparse
+import csv
+import glob
+import io
+import os
+import random
+import sys
+import time
+from contextlib import redirect_stdout
+from functools import partial
+from multiprocessing import Pool
+
+from emulator import *
+from Robot import *
+from Exploration_Emulated import ExplorationRobot, ExplorationDriver
+from floodfill import FloodFillDriver
+from dstar import DStarLiteDriver
+from proven import ProvenExplorationDriver, unexplored_cells
+from frontier import FrontierDriver
+from savedmap import SavedMap, SpeedRunDriver
+import resultcache
+from cellmaze import CellBoardLoader
+import mazegen
+from runtrace import TraceRecorder
+from profiler import Profiler
+from motion import MotionProfile
+
+
+# ---------------------------------------------------------------------------
+# Headless batch runner
+#
+#   python Emulator/batch.py                      # every board × every driver
+#   python Emulator/batch.py -d astar -o out.csv  # one driver, CSV to a file
+#   python Emulator/batch.py -g kruskal -s 64x64 -n 1000 --seed 7
+#                                                 # generated boards, no files
+#   python Emulator/batch.py -d frontier --maps maps/ # explore, save each map
+#   python Emulator/batch.py -d speedrun --maps maps/ # speed runs on the maps
+#   python Emulator/batch.py -d speedrun --maps maps/ --map-explorer proven
+#   python Emulator/batch.py --cache results.db       # reuse earlier results
+# ---------------------------------------------------------------------------
+
+# name -> (driver class, robot class)
+DRIVERS = {
+    "right":       (RightHandDriver,   Robot),
+    "left":        (LeftHandDriver,    Robot),
+    "random":      (RandomDriver,      Robot),
+    "astar":       (AStarDriver,       Robot),
+    "astar-time":  (partial(AStarDriver, planner="fastest"), Robot),
+    "astar-trap":  (partial(AStarDriver, planner="fastest", cost=MotionProfile()), Robot),
+    "astar-diag":  (partial(AStarDriver, planner="diagonal", cost=MotionProfile()), Robot),
+    "exploration": (ExplorationDriver, ExplorationRobot),
+    "floodfill":   (FloodFillDriver,   ExplorationRobot),
+    "dstar":       (DStarLiteDriver,   ExplorationRobot),
+    "proven":      (ProvenExplorationDriver, ExplorationRobot),
+    "frontier":    (FrontierDriver,    ExplorationRobot),
+    "speedrun":    (SpeedRunDriver,    Robot),
+    "speedrun-diag": (partial(SpeedRunDriver, planner="diagonal", cost=MotionProfile()), Robot),
+}
+
+# Drivers that plan on a saved map (--maps) instead of the board; only run
+# when asked for, never in the same batch as the explorations writing them
+MAP_DRIVERS = {"speedrun", "speedrun-diag"}
+
+# Drivers whose rows can't be cached: they need input besides the board
+UNCACHED = MAP_DRIVERS
+
+# Competition maze files, loaded as a CellBoard; everything else is ASCII
+CELL_FORMATS = (".maz", ".num")
+
+# steps counts a diagonal cell (D) as one step, like F, so diagonal and
+# orthogonal planners compare on the same path; turns are 90-degree turns.
+# unexplored / mapped: reachable cells an exploration never sensed from, and
+# whether that is none; empty for drivers that don't map
+FIELDS = ["board", "driver", "result", "steps", "turns", "est_time", "unexplored", "mapped",
+          "wall_time"]
+
+
+def load_board(spec):
+    # A board spec is a file path, or "algorithm:ROWSxCOLS:seed" for a maze
+    # that mazegen rebuilds inside the worker
+    if spec.count(":") == 2 and spec.split(":")[0] in mazegen.GENERATORS:
+        algorithm, size, seed = spec.split(":")
+        rows, cols = (int(n) for n in size.split("x"))
+        return mazegen.generate(algorithm, rows, cols, int(seed))
+    if os.path.splitext(spec)[1].lower() in CELL_FORMATS:
+        return CellBoardLoader.from_file(spec)
+    return BoardLoader.from_file(spec)
+
+
+def board_name(board_spec):
+    # The spec without its directory, so a board reached by any path gets the
+    # same trace and map files and the same random streams
+    return os.path.basename(board_spec).replace(":", "_")
+
+
+def trace_path(trace_dir, board_spec, driver_name):
+    return os.path.join(trace_dir, f"{board_name(board_spec)}.{driver_name}.mmtr")
+
+
+def map_path(map_dir, board_spec, driver_name):
+    # One file per board and exploration driver, so explorers in the same
+    # batch never write the same map
+    return os.path.join(map_dir, f"{board_name(board_spec)}.{driver_name}.mmap")
+
+
+def run_job(job):
+    board_spec, driver_name, trace_dir, profile, motion, maps, cache, seed = job
+    # maps: (directory, explorer whose maps the speed-run drivers load)
+    map_dir, map_explorer = maps or (None, None)
+    driver_class, robot_class = DRIVERS[driver_name]
+
+    row = {"board": board_spec, "driver": driver_name}
+    t0  = time.perf_counter()
+    try:
+        board = load_board(board_spec)
+
+        # cache: (path, canonical); runs that trace, profile or save a map
+        # always simulate, as a cached row carries none of those
+        key = None
+        saves_map = map_dir and robot_class is ExplorationRobot
+        if (cache and driver_name not in UNCACHED and not trace_dir and not profile
+                and not saves_map):
+            path, canonical = cache
+            version = resultcache.code_version(driver_class, robot_class)
+            options = (motion, seed) if driver_name == "random" else (motion,)
+            key     = resultcache.cache_key(board, driver_name, version, options, canonical)
+            hit     = resultcache.reader(path).get(key)
+            if hit is not None:
+                row.update(hit, cached=True, cache_key=key)
+                row["wall_time"] = f"{time.perf_counter() - t0:.6f}"
+                return row
+
+        if board.cell_based and robot_class is ExplorationRobot:
+            robot = robot_class(board.start, board.goal, (board.rows, board.cols), cell_based=True)
+        else:
+            robot = robot_class(board.start, board.goal, (board.rows, board.cols))
+
+        if driver_name == "random":
+            # Its own stream per board, so runs repeat whatever the worker
+            driver = RandomDriver(random.Random(stream_seed(seed, board_name(board_spec))))
+        else:
+            driver = driver_class()
+        if driver_name in MAP_DRIVERS:
+            if not map_dir:
+                raise ValueError("needs --maps")
+            driver.saved = SavedMap.load(map_path(map_dir, board_spec, map_explorer))
+        trace  = TraceRecorder(board, robot, driver) if trace_dir else None
+        prof   = Profiler() if profile else None
+
+        # Drivers print progress (e.g. the discovered maze); keep workers quiet
+        with redirect_stdout(io.StringIO()):
+            result = Emulator(board, robot, driver, live_run=False, trace=trace,
+                              profiler=prof).run()
+        if trace:
+            trace.save(trace_path(trace_dir, board_spec, driver_name))
+        if saves_map:
+            SavedMap.from_robot(robot, board).save(map_path(map_dir, board_spec, driver_name))
+
+        est = Result(robot, MotionProfile() if motion else None).estimate()
+        unexplored = None
+        if robot_class is ExplorationRobot:
+            unexplored = unexplored_cells(board, robot)
+        row.update(result=result,
+                   steps=est["num_steps"] + est["num_diagonal"],
+                   turns=est["num_turns"],
+                   est_time=f"{est['total_time']:.2f}",
+                   unexplored=unexplored,
+                   mapped=None if unexplored is None else ("yes" if unexplored == 0 else "no"))
+        if prof:
+            row["profile"] = prof           # merged by run_batch, not written
+        if key:
+            row["cache_key"] = key          # stored by run_batch, not written
+    except Exception as e:
+        row.update(result=f"ERROR: {e}", steps="", turns="", est_time="", unexplored="", mapped="")
+
+    row["wall_time"] = f"{time.perf_counter() - t0:.6f}"
+    return row
+
+
+def find_boards(paths):
+    boards = []
+    for path in paths:
+        if os.path.isdir(path):
+            for ext in (".txt",) + CELL_FORMATS:
+                boards.extend(sorted(glob.glob(os.path.join(path, "*" + ext))))
+        else:
+            boards.append(path)
+    return boards
+
+
+def run_batch(jobs, out, processes=None, chunksize=4, cache=None):
+    # cache: a writable resultcache.ResultCache for the rows workers computed
+    writer = csv.DictWriter(out, fieldnames=FIELDS, extrasaction="ignore")
+    writer.writeheader()
+
+    counts  = {}
+    profile = Profiler()
+    with Pool(processes) as pool:
+        for row in pool.imap(run_job, jobs, chunksize):
+            writer.writerow(row)
+            key = row["result"].split(":")[0]
+            counts[key] = counts.get(key, 0) + 1
+            if "profile" in row:
+                profile.merge(row["profile"])
+            if cache is not None and "cache_key" in row:
+                if row.get("cached"):
+                    cache.touch(row["cache_key"])
+                    cache.hits += 1
+                else:
+                    cache.put(row["cache_key"], row)
+                    cache.misses += 1
+    return counts, profile
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run boards × drivers headless across a process pool.")
+    parser.add_argument("boards", nargs="*", default=["boards"],
+                        help="board files or directories of *.txt/*.maz/*.num boards (default: boards/)")
+    parser.add_argument("-d", "--driver", action="append", choices=sorted(DRIVERS),
+                        help="driver to run (repeatable, default: all)")
+    parser.add_argument("-j", "--processes", type=int, default=None,
+                        help="worker processes (default: one per core)")
+    parser.add_argument("-o", "--out", default="-",
+                        help="CSV output path (default: stdout)")
+    parser.add_argument("-g", "--generate", choices=sorted(mazegen.GENERATORS),
+                        help="run on generated mazes instead of board files")
+    parser.add_argument("-s", "--size", default="16x16",
+                        help="generated maze size in cells, ROWSxCOLS (default: 16x16)")
+    parser.add_argument("-n", "--count", type=int, default=100,
+                        help="number of generated mazes (default: 100)")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="master seed for generated mazes and random-driver runs (default: 0)")
+    parser.add_argument("--traces", metavar="DIR",
+                        help="write a binary trace of every run into DIR")
+    parser.add_argument("--profile", action="store_true",
+                        help="profile every run and print the merged profile to stderr")
+    parser.add_argument("--motion", action="store_true",
+                        help="estimate times with the trapezoidal motion profile")
+    parser.add_argument("--cache", metavar="FILE",
+                        help="reuse and store results of deterministic runs in FILE")
+    parser.add_argument("--canonical", action="store_true",
+                        help="let a board and its mirror image share cache entries")
+    parser.add_argument("--cache-size", type=int, default=100_000,
+                        help="most results the cache keeps (default: 100000)")
+    parser.add_argument("--maps", metavar="DIR",
+                        help="exploration drivers save what they mapped into DIR, "
+                             "speed-run drivers plan on it")
+    parser.add_argument("--map-explorer", default="frontier",
+                        choices=sorted(d for d, (_, r) in DRIVERS.items() if r is ExplorationRobot),
+                        help="exploration driver whose maps the speed-run drivers "
+                             "load (default: frontier)")
+    args = parser.parse_args(argv)
+
+    if args.generate:
+        boards = [f"{args.generate}:{args.size}:{seed}"
+                  for seed in mazegen.seeds(args.seed, args.count)]
+    else:
+        boards = find_boards(args.boards)
+
+    drivers = args.driver or [d for d in DRIVERS if d not in MAP_DRIVERS]
+    cache   = (args.cache, args.canonical) if args.cache else None
+    maps    = (args.maps, args.map_explorer) if args.maps else None
+    jobs    = [(b, d, args.traces, args.profile, args.motion, maps, cache, args.seed)
+               for b in boards for d in drivers]
+    if args.traces:
+        os.makedirs(args.traces, exist_ok=True)
+    if args.maps:
+        os.makedirs(args.maps, exist_ok=True)
+
+    # Created before the workers start, so they can open it read-only
+    store = resultcache.ResultCache(args.cache, max_entries=args.cache_size) if args.cache else None
+
+    t0 = time.perf_counter()
+    if args.out == "-":
+        counts, profile = run_batch(jobs, sys.stdout, args.processes, cache=store)
+    else:
+        with open(args.out, "w", newline="") as f:
+            counts, profile = run_batch(jobs, f, args.processes, cache=store)
+
+    summary = ", ".join(f"{k}: {v}" for k, v in sorted(counts.items()))
+    print(f"{len(jobs)} runs in {time.perf_counter() - t0:.2f}s  ({summary})", file=sys.stderr)
+    if store is not None:
+        store.evict()
+        store.close()
+        print(f"cache: {store.hits} hits, {store.misses} stored, "
+              f"{store.evictions} evicted", file=sys.stderr)
+    if args.profile:
+        profile.report(sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+import os
+import hashlib
+
+
+# ---------------------------------------------------------------------------
+# Cell-based maze with four wall bits per cell
+#
+# Unlike the ASCII Board, where walls fill whole grid squares, a CellBoard
+# has one square per real maze cell and stores the walls around it as a
+# nibble: 1 = N, 2 = E, 4 = S, 8 = W (bit d for DIR index d). Two cells are
+# packed per byte. Row 0 is the north edge, as everywhere else in the
+# emulator, so Robot and the drivers move on it without any translation.
+# ---------------------------------------------------------------------------
+
+N, E, S, W = 1, 2, 4, 8
+
+DELTA    = [(-1, 0), (0, 1), (1, 0), (0, -1)]      # N, E, S, W
+OPPOSITE = [S, W, N, E]
+
+
+class CellBoard:
+    cell_based = True
+
+    def __init__(self, rows, cols, start=None, goals=None):
+        self.rows  = rows
+        self.cols  = cols
+        self.walls = bytearray((rows * cols + 1) // 2)
+
+        # Competition defaults: bottom-left start, 2×2 centre goal
+        self.start = start if start is not None else (rows - 1, 0)
+        if goals is None:
+            r, c  = max(rows // 2 - 1, 0), max(cols // 2 - 1, 0)
+            goals = [(r + i, c + j) for i in range(min(rows, 2)) for j in range(min(cols, 2))]
+        self.goals = frozenset(goals)
+        self.goal  = min(self.goals)
+
+    # ------------------------------------------------------------------
+    # Wall bits
+    # ------------------------------------------------------------------
+
+    def cell_walls(self, pos):
+        r, c = pos
+        k    = r * self.cols + c
+        return self.walls[k >> 1] >> ((k & 1) << 2) & 0xF
+
+    def _or_bits(self, r, c, bits):
+        k = r * self.cols + c
+        self.walls[k >> 1] |= bits << ((k & 1) << 2)
+
+    def set_wall(self, pos, d):
+        # Walls are shared, so set the matching bit on the neighbour too
+        r, c = pos
+        self._or_bits(r, c, 1 << d)
+        dr, dc = DELTA[d]
+        nr, nc = r + dr, c + dc
+        if 0 <= nr < self.rows and 0 <= nc < self.cols:
+            self._or_bits(nr, nc, OPPOSITE[d])
+
+    def close_border(self):
+        for r in range(self.rows):
+            self._or_bits(r, 0, W)
+            self._or_bits(r, self.cols - 1, E)
+        for c in range(self.cols):
+            self._or_bits(0, c, N)
+            self._or_bits(self.rows - 1, c, S)
+
+    # ------------------------------------------------------------------
+    # Board interface used by Robot, the drivers and astar
+    # ------------------------------------------------------------------
+
+    def is_wall(self, pos):
+        # Cells themselves are never walls; only what lies off the board is
+        r, c = pos
+        return not (0 <= r < self.rows and 0 <= c < self.cols)
+
+    def can_move(self, pos, d):
+        return not self.cell_walls(pos) >> d & 1
+
+    def open_mask(self, pos):
+        # The wall nibbles already are the per-cell sensor table
+        return self.cell_walls(pos) ^ 0xF
+
+    def neighbours(self, pos):
+        r, c  = pos
+        walls = self.cell_walls(pos)
+        for d in range(4):
+            if not walls >> d & 1:
+                dr, dc = DELTA[d]
+                yield (r + dr, c + dc)
+
+    def is_goal(self, pos):
+        return pos in self.goals
+
+    def fingerprint(self):
+        # Content hash of the wall bits; computed once, so walls must not be
+        # changed after the board is first planned on
+        if getattr(self, "_fingerprint", None) is None:
+            h = hashlib.blake2b(digest_size=16)
+            h.update(f"cells:{self.rows}x{self.cols}:".encode())
+            h.update(self.walls)
+            self._fingerprint = h.hexdigest()
+        return self._fingerprint
+
+    def printBoard(self, robot):
+        for line in self.render(robot.curr_pos):
+            print(line)
+
+    def render(self, robot_pos=None):
+        lines = []
+        for r in range(self.rows):
+            top = "o"
+            mid = ""
+            for c in range(self.cols):
+                walls = self.cell_walls((r, c))
+                top  += ("---" if walls & N else "   ") + "o"
+                mid  += "|" if walls & W else " "
+                if (r, c) == robot_pos:
+                    mid += " * "
+                elif (r, c) in self.goals:
+                    mid += " G "
+                elif (r, c) == self.start:
+                    mid += " S "
+                else:
+                    mid += "   "
+            mid += "|" if walls & E else " "
+            lines.append(top)
+            lines.append(mid)
+        bottom = "o"
+        for c in range(self.cols):
+            bottom += ("---" if self.cell_walls((self.rows - 1, c)) & S else "   ") + "o"
+        lines.append(bottom)
+        return lines
+
+
+# ---------------------------------------------------------------------------
+# Loaders for the usual competition maze files
+#
+#   .maz  one byte per cell, column-major from the south-west corner
+#         (byte x * rows + y), bits 1 N, 2 E, 4 S, 8 W
+#   .num  one line per cell: "x y N E S W" with 0/1 flags, y = 0 at the south
+#   .txt  posts-and-walls drawing ("o---o" / "|   |"), S and G marking cells
+# ---------------------------------------------------------------------------
+
+class CellBoardLoader:
+    @staticmethod
+    def from_file(filename):
+        ext = os.path.splitext(filename)[1].lower()
+        if ext == ".maz":
+            return CellBoardLoader.from_maz(filename)
+        if ext == ".num":
+            return CellBoardLoader.from_num(filename)
+        return CellBoardLoader.from_text(filename)
+
+    @staticmethod
+    def from_maz(filename):
+        with open(filename, "rb") as f:
+            data = f.read()
+        size = int(round(len(data) ** 0.5))
+        if size * size != len(data):
+            raise ValueError(f"{filename}: {len(data)} bytes is not a square maze")
+
+        board = CellBoard(size, size)
+        for x in range(size):
+            for y in range(size):
+                board._or_bits(size - 1 - y, x, data[x * size + y] & 0xF)
+        board.close_border()
+        return board
+
+    @staticmethod
+    def from_num(filename):
+        cells = []
+        with open(filename, "r") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 6:
+                    cells.append([int(p) for p in parts])
+        cols = max(x for x, *_ in cells) + 1
+        rows = max(y for _, y, *_ in cells) + 1
+
+        board = CellBoard(rows, cols)
+        for x, y, n, e, s, w in cells:
+            board._or_bits(rows - 1 - y, x, n * N | e * E | s * S | w * W)
+        board.close_border()
+        return board
+
+    @staticmethod
+    def from_text(filename):
+        with open(filename, "r") as f:
+            lines = [line.rstrip("\r\n") for line in f if line.strip()]
+
+        # Post rows and cell rows alternate; each cell is three characters
+        rows = (len(lines) - 1) // 2
+        cols = (max(len(line) for line in lines) - 1) // 4
+        board = CellBoard(rows, cols)
+
+        start = None
+        goals = []
+        for r in range(rows):
+            top, mid, bottom = lines[2 * r], lines[2 * r + 1], lines[2 * r + 2]
+            for c in range(cols):
+                x = 4 * c
+                if top[x + 1:x + 4].strip():
+                    board.set_wall((r, c), 0)
+                if bottom[x + 1:x + 4].strip():
+                    board.set_wall((r, c), 2)
+                if mid[x:x + 1].strip():
+                    board.set_wall((r, c), 3)
+                if mid[x + 4:x + 5].strip():
+                    board.set_wall((r, c), 1)
+                body = mid[x + 1:x + 4].upper()
+                if "S" in body:
+                    start = (r, c)
+                if "G" in body:
+                    goals.append((r, c))
+        board.close_border()
+
+        if start is not None:
+            board.start = start
+        if goals:
+            board.goals = frozenset(goals)
+            board.goal  = min(board.goals)
+        return board
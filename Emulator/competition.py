@@ -0,0 +1,243 @@
+import argparse
+import csv
+import io
+import sys
+import time
+from contextlib import redirect_stdout
+from types import SimpleNamespace
+
+from emulator import Emulator, Result
+from Robot import CostModel, fastest_path, diagonal_path
+from Exploration_Emulated import ExplorationRobot
+from savedmap import SavedMap, KnownBoard
+from motion import MotionProfile
+from batch import DRIVERS, find_boards, load_board
+import mazegen
+
+
+# ---------------------------------------------------------------------------
+# Competition run
+#
+# The whole sequence a contest scores, on one ExplorationRobot:
+#
+#   explore   an exploration driver from the start cell; floodfill / dstar
+#             stop at the goal, proven once the shortest path is known,
+#             frontier once the maze is fully mapped
+#   return    the fastest known path back to the start
+#   runs      N speed runs start -> goal on the learned map, each followed
+#             by a drive back to the start
+#
+# Every phase is timed with Result's model (flat STEP_TIME / TURN_TIME, or a
+# MotionProfile with --motion). Exploration stops in every cell; planned
+# runs are timed from their command strings. A Rule turns the run times and
+# the maze time (everything since the robot first left the start) into the
+# score:
+#
+#   score = min over runs of  run_time + penalty * maze_time at its start
+#
+# counting only runs that finish inside the time limit.
+#
+#   python Emulator/competition.py boards/hard1.txt -e proven --rule classic
+#   python Emulator/competition.py -g kruskal -s 16x16 -n 50 -e floodfill --motion
+# ---------------------------------------------------------------------------
+
+PLANNERS = {
+    "fastest":  fastest_path,
+    "diagonal": diagonal_path,
+}
+
+
+class Rule:
+    def __init__(self, runs=5, time_limit=600.0, penalty=0.0):
+        self.runs       = runs                 # speed runs after exploring
+        self.time_limit = time_limit           # seconds of maze time
+        self.penalty    = penalty              # share of maze time added to a run
+
+    def score(self, runs):
+        # runs: [(run_time, maze_time at its start)]; None if none counts
+        scores = [t + self.penalty * start for t, start in runs
+                  if start + t <= self.time_limit]
+        return min(scores) if scores else None
+
+
+RULES = {
+    "best":    Rule(),                         # fastest run, exploration free
+    "classic": Rule(penalty=1 / 30),           # 1/30 of the maze time per run
+}
+
+
+def command_time(commands, profile=None):
+    return Result(SimpleNamespace(command_string=commands), profile).estimate()["total_time"]
+
+
+def reactive_time(steps, turns, profile=None):
+    return Result(SimpleNamespace(steps=steps, turns=turns), profile).estimate()["total_time"]
+
+
+def plan(known, start, heading, goals, planner, profile=None):
+    # Quickest known command string from (start, heading) to any goal cell
+    cost = profile or CostModel()
+    best, best_time = None, None
+    for goal in sorted(goals):
+        commands = PLANNERS[planner](known, start, heading, goal, cost)
+        if commands is None:
+            continue
+        t = command_time(commands, profile)
+        if best is None or t < best_time:
+            best, best_time = commands, t
+    return best
+
+
+def drive(robot, board, commands):
+    # Carry out a planned command string on an ExplorationRobot, including
+    # the 45-degree turns and diagonal cells of a diagonal run; False if a
+    # wall stops it
+    partner = None
+    for cmd in commands:
+        if cmd in "FD":
+            if robot.front_wall(board):
+                return False
+            robot.move_forward(board)
+            if cmd == "D":
+                robot.direction, partner = partner, robot.direction
+        elif cmd == "R":
+            robot.turn_right_action()
+        elif cmd == "L":
+            robot.turn_left_action()
+        else:
+            if partner is None:
+                partner = (robot.direction + (1 if cmd == "r" else -1)) % 4
+            else:
+                robot.direction, partner = partner, None
+            robot.turns += 1
+    return True
+
+
+def run_competition(board, explorer="proven", planner="diagonal", rule=None, profile=None):
+    rule = rule or RULES["classic"]
+    driver_class, robot_class = DRIVERS[explorer]
+    if robot_class is not ExplorationRobot:
+        raise ValueError(f"{explorer} is not an exploration driver")
+
+    robot = ExplorationRobot(board.start, board.goal, (board.rows, board.cols),
+                             cell_based=board.cell_based)
+    goals = getattr(board, "goals", None) or [board.goal]
+    out   = {"result": "SUCCESS", "explore_time": None, "return_time": None,
+             "runs": [], "maze_time": 0.0, "score": None}
+
+    # Explore
+    with redirect_stdout(io.StringIO()):
+        result = Emulator(board, robot, driver_class(), live_run=False).run()
+    out["explore_time"] = reactive_time(robot.steps, robot.turns, profile)
+    out["maze_time"]    = out["explore_time"]
+    if result != "SUCCESS":
+        out["result"] = f"FAILED (explore): {result}"
+        return out
+
+    # Drivers that stop on reaching the goal have not sensed from it yet
+    robot.detect_walls(board)
+    known = KnownBoard(SavedMap.from_robot(robot, board))
+    start = [robot.start_pos]
+
+    # Return to the start
+    home = plan(known, robot.curr_pos, robot.direction, start, planner, profile)
+    if home is None or not drive(robot, board, home):
+        out["result"] = "FAILED (return)"
+        return out
+    out["return_time"] = command_time(home, profile)
+    out["maze_time"]  += out["return_time"]
+
+    # Speed runs, each followed by the drive home
+    for _ in range(rule.runs):
+        run = plan(known, robot.curr_pos, robot.direction, goals, planner, profile)
+        if run is None or not drive(robot, board, run):
+            out["result"] = "FAILED (run)"
+            break
+        t = command_time(run, profile)
+        out["runs"].append((t, out["maze_time"]))
+        out["maze_time"] += t
+        if out["maze_time"] > rule.time_limit:
+            break
+        home = plan(known, robot.curr_pos, robot.direction, start, planner, profile)
+        if home is None or not drive(robot, board, home):
+            out["result"] = "FAILED (return)"
+            break
+        out["maze_time"] += command_time(home, profile)
+
+    out["score"] = rule.score(out["runs"])
+    return out
+
+
+def fmt(t):
+    return "" if t is None else f"{t:.2f}"
+
+
+FIELDS = ["board", "explorer", "result", "explore_time", "return_time", "best_run",
+          "runs", "maze_time", "score", "wall_time"]
+
+
+def main(argv=None):
+    explorers = sorted(d for d, (_, robot) in DRIVERS.items() if robot is ExplorationRobot)
+    parser = argparse.ArgumentParser(description="Explore, return and speed-run, scored as a contest.")
+    parser.add_argument("boards", nargs="*", default=["boards"],
+                        help="board files or directories (default: boards/)")
+    parser.add_argument("-e", "--explorer", choices=explorers, default="proven",
+                        help="exploration driver (default: proven)")
+    parser.add_argument("-p", "--planner", choices=sorted(PLANNERS), default="diagonal",
+                        help="planner for the return and speed runs (default: diagonal)")
+    parser.add_argument("--rule", choices=sorted(RULES), default="classic",
+                        help="scoring rule (default: classic)")
+    parser.add_argument("--runs", type=int, help="speed runs (default: from the rule)")
+    parser.add_argument("--time-limit", type=float, help="maze time limit in seconds")
+    parser.add_argument("--penalty", type=float, help="share of maze time added to each run")
+    parser.add_argument("--motion", action="store_true",
+                        help="time runs with the trapezoidal motion profile")
+    parser.add_argument("-g", "--generate", choices=sorted(mazegen.GENERATORS),
+                        help="run on generated mazes instead of board files")
+    parser.add_argument("-s", "--size", default="16x16",
+                        help="generated maze size in cells, ROWSxCOLS (default: 16x16)")
+    parser.add_argument("-n", "--count", type=int, default=100,
+                        help="number of generated mazes (default: 100)")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="master seed for generated mazes (default: 0)")
+    args = parser.parse_args(argv)
+
+    preset = RULES[args.rule]
+    rule   = Rule(runs=preset.runs if args.runs is None else args.runs,
+                  time_limit=preset.time_limit if args.time_limit is None else args.time_limit,
+                  penalty=preset.penalty if args.penalty is None else args.penalty)
+    profile = MotionProfile() if args.motion else None
+
+    if args.generate:
+        boards = [f"{args.generate}:{args.size}:{seed}"
+                  for seed in mazegen.seeds(args.seed, args.count)]
+    else:
+        boards = find_boards(args.boards)
+
+    writer = csv.DictWriter(sys.stdout, fieldnames=FIELDS)
+    writer.writeheader()
+    scores = []
+    for spec in boards:
+        t0  = time.perf_counter()
+        out = run_competition(load_board(spec), args.explorer, args.planner, rule, profile)
+        writer.writerow({
+            "board":        spec,
+            "explorer":     args.explorer,
+            "result":       out["result"],
+            "explore_time": fmt(out["explore_time"]),
+            "return_time":  fmt(out["return_time"]),
+            "best_run":     fmt(min((t for t, _ in out["runs"]), default=None)),
+            "runs":         len(out["runs"]),
+            "maze_time":    fmt(out["maze_time"]),
+            "score":        fmt(out["score"]),
+            "wall_time":    f"{time.perf_counter() - t0:.6f}",
+        })
+        if out["score"] is not None:
+            scores.append(out["score"])
+
+    mean = sum(scores) / len(scores) if scores else 0.0
+    print(f"{len(boards)} boards, {len(scores)} scored, mean score {mean:.2f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+import heapq
+
+from Exploration_Emulated import DIR, DELTA
+
+
+# ---------------------------------------------------------------------------
+# D* Lite on the discovered map
+#
+# Plans from the goal back to the robot over ExplorationRobot's map, with
+# every unknown cell treated as open. When detect_walls finds a wall only
+# the cells around it are re-queued and the existing search tree is repaired
+# (Koenig & Likhachev's D* Lite), instead of searching again from scratch.
+# ---------------------------------------------------------------------------
+
+INF = float("inf")
+
+
+def _h(a, b):
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+
+class DStarLite:
+    def __init__(self, rows, cols, start, goals, blocked):
+        self.rows    = rows
+        self.cols    = cols
+        self.start   = start
+        self.last    = start
+        self.goals   = set(goals)
+        self.blocked = blocked
+        self.km      = 0
+        self.g       = {}
+        self.rhs     = {}
+        self.queue   = []
+        self.queued  = {}                    # cell -> key currently queued
+        self.expansions = 0
+
+        for goal in self.goals:
+            self.rhs[goal] = 0
+            self._push(goal)
+
+    def _neighbours(self, cell):
+        r, c = cell
+        for d in range(4):
+            if not self.blocked(r, c, d):
+                dr, dc = DELTA[DIR[d]]
+                yield (r + dr, c + dc)
+
+    def _key(self, cell):
+        m = min(self.g.get(cell, INF), self.rhs.get(cell, INF))
+        return (m + _h(self.start, cell) + self.km, m)
+
+    def _push(self, cell):
+        key = self._key(cell)
+        self.queued[cell] = key
+        heapq.heappush(self.queue, (key, cell))
+
+    def _update(self, cell):
+        if cell not in self.goals:
+            self.rhs[cell] = min([1 + self.g.get(n, INF) for n in self._neighbours(cell)],
+                                 default=INF)
+        self.queued.pop(cell, None)
+        if self.g.get(cell, INF) != self.rhs.get(cell, INF):
+            self._push(cell)
+
+    def _top(self):
+        # Drop entries that were superseded or removed since they were pushed
+        while self.queue:
+            key, cell = self.queue[0]
+            if self.queued.get(cell) == key:
+                return key, cell
+            heapq.heappop(self.queue)
+        return (INF, INF), None
+
+    def plan(self):
+        while True:
+            key, cell = self._top()
+            start_key = self._key(self.start)
+            if cell is None or (key >= start_key and
+                                self.rhs.get(self.start, INF) == self.g.get(self.start, INF)):
+                return
+            self.expansions += 1
+
+            new_key = self._key(cell)
+            if key < new_key:
+                self._push(cell)
+                continue
+
+            heapq.heappop(self.queue)
+            del self.queued[cell]
+            if self.g.get(cell, INF) > self.rhs.get(cell, INF):
+                self.g[cell] = self.rhs[cell]
+                for n in self._neighbours(cell):
+                    self._update(n)
+            else:
+                self.g[cell] = INF
+                self._update(cell)
+                for n in self._neighbours(cell):
+                    self._update(n)
+
+    def move_to(self, cell):
+        self.km   += _h(self.last, cell)
+        self.last  = cell
+        self.start = cell
+
+    def walls_changed(self, cells):
+        # cells: every cell next to a newly found wall (both sides)
+        for cell in cells:
+            self._update(cell)
+
+    def next_direction(self, heading):
+        # Best first step from start, keeping the current heading on ties
+        r, c = self.start
+        best_d, best = None, INF
+        for d in [heading] + [d for d in range(4) if d != heading]:
+            if self.blocked(r, c, d):
+                continue
+            dr, dc = DELTA[DIR[d]]
+            cost = 1 + self.g.get((r + dr, c + dc), INF)
+            if cost < best:
+                best_d, best = d, cost
+        return best_d
+
+
+# ---------------------------------------------------------------------------
+# D* Lite driver (runs on ExplorationRobot)
+# ---------------------------------------------------------------------------
+
+class DStarLiteDriver:
+    def __init__(self):
+        self.planner = None
+
+    def step(self, robot, board):
+        if self.planner is None:
+            rows, cols = robot.board_size
+            goals = getattr(board, "goals", None) or [robot.goal_pos]
+            self.planner = DStarLite(rows, cols, robot.curr_pos, goals, robot.is_blocked)
+
+        self._sense(robot, board)
+        d = self.planner.next_direction(robot.direction)
+        if d is None:
+            # No route to the goal on the known map
+            return
+
+        while robot.direction != d:
+            if (d - robot.direction) % 4 <= (robot.direction - d) % 4:
+                robot.turn_right_action()
+            else:
+                robot.turn_left_action()
+        if robot.front_wall(board):
+            # Only possible for the unsensed side behind us; replan next step
+            self._sense(robot, board)
+            return
+
+        robot.move_forward(board)
+        robot.map.visit(*robot.curr_pos)
+        self.planner.move_to(robot.curr_pos)
+
+    def _sense(self, robot, board):
+        robot.detect_walls(board)
+        self.planner.walls_changed(robot.sensed_cells())
+        self.planner.plan()
@@ -1,57 +1,234 @@
 import time
 import os
 import random
+import hashlib
+
+from render import TerminalRenderer
+from motion import compile_commands
 
 
 class Emulator:
-    def __init__(self, board, robot, driver, live_run=False):
+    # live_run=True draws the run in the terminal as it happens (with the
+    # given renderer, or a TerminalRenderer); live_run=False, the default, is
+    # headless and never touches the terminal. trace takes a
+    # runtrace.TraceRecorder that the robot feeds with every action. max_steps
+    # defaults to a budget that grows with the board (see step_budget).
+    # profiler takes a profiler.Profiler to count sensor queries and time each
+    # phase of each step.
+    def __init__(self, board, robot, driver, live_run=False, renderer=None, trace=None,
+                 max_steps=None, profiler=None):
         self.board = board
         self.robot = robot
         self.driver = driver
         self.live_run = live_run
+        self.renderer = (renderer or TerminalRenderer()) if live_run else None
+        self.trace = trace
+        self.profiler = profiler
+        self.max_steps = max_steps or step_budget(board)
+        self.ticks = 0
+        self.cycle = None                      # (first step, length) once a cycle is found
 
     def run(self):
-        for _ in range(1000):
+        if self.trace is not None:
+            self.robot.trace = self.trace
+
+        # Drivers whose next move depends only on the robot's state (plus
+        # whatever state_key returns) are deterministic: once (position,
+        # heading, driver state) repeats, the run will repeat forever, so stop
+        # there. Drivers without state_key are never cut short.
+        state_key = getattr(self.driver, "state_key", None)
+        seen      = {}
+
+        # A driver with finished(robot, board) decides itself when the run is
+        # over (e.g. exploration that ends once the path is known); the rest
+        # stop on reaching the goal. Either way the run only succeeds if the
+        # robot has been on the goal.
+        finished = getattr(self.driver, "finished", None)
+        reached  = False
+
+        # The driver sees a counting wrapper only while profiling
+        prof  = self.profiler
+        board = self.board if prof is None else prof.attach(self.board, self.robot)
+
+        result = "FAILED (loop)"
+        ticks  = 0
+        for step in range(self.max_steps):
+            if prof is not None:
+                t0 = time.perf_counter_ns()
             if self.board.is_goal(self.robot.curr_pos):
-                return "SUCCESS"
-            self.driver.step(self.robot, self.board)
-            if not self.live_run:
-                os.system("cls" if os.name == "nt" else "clear")
-                self.board.printBoard(self.robot)
-                time.sleep(0.05)
-        return "FAILED (loop)"
+                reached = True
+                if finished is None:
+                    result = "SUCCESS"
+                    break
+            if finished is not None and finished(self.robot, board):
+                result = "SUCCESS" if reached else "FAILED (goal not reached)"
+                break
+            if state_key is not None:
+                state = (self.robot.curr_pos, self.robot.direction, state_key(self.robot))
+                first = seen.setdefault(state, step)
+                if first != step:
+                    self.cycle = (first, step - first)
+                    result = f"FAILED (cycle): length {step - first}"
+                    break
+            if prof is not None:
+                t1 = time.perf_counter_ns()
+            self.driver.step(self.robot, board)
+            ticks += 1
+            if prof is not None:
+                t2 = time.perf_counter_ns()
+                prof.add("driver", t2 - t1)
+            if self.renderer:
+                self.renderer.draw(self.board, self.robot, step)
+                if prof is not None:
+                    prof.add("render", time.perf_counter_ns() - t2)
+            if prof is not None:
+                prof.add("step", time.perf_counter_ns() - t0)
+        if prof is not None:
+            prof.detach(self.robot, ticks)
+        if self.renderer:
+            self.renderer.close(self.board, self.robot)
+        if self.trace is not None:
+            self.trace.finish(result, ticks)
+        self.ticks = ticks
+        return result
+
+
+def step_budget(board):
+    # A deterministic driver has at most 4 states (headings) per cell before
+    # it must repeat, so 4 steps per cell covers any run that can still reach
+    # the goal; 1000 is kept as the floor for the small boards.
+    return max(1000, 4 * board.rows * board.cols)
 
 
 class Board:
+    _OPEN = bytes.maketrans(b"\x00\x01", b"\x01\x00")
+
     def __init__(self, grid, start, goal):
-        self.grid = grid
+        self._grid = grid
         self.start = start
         self.goal = goal
+        self.rows = len(grid)
+        self.cols = max((len(row) for row in grid), default=0)
+
+        # Flat occupancy buffer with a one-cell wall border, so is_wall is a
+        # single indexed read: cell (r, c) lives at (r + 1) * stride + c + 1.
+        # Cells past the end of a short row count as wall.
+        self.stride = self.cols + 2
+        self.step   = (-self.stride, 1, self.stride, -1)   # N, E, S, W
+        self.cells  = bytearray(b"\x01") * (self.stride * (self.rows + 2))
+        for r, row in enumerate(grid):
+            base = (r + 1) * self.stride + 1
+            for c in range(len(row)):
+                if row[c] != 1:
+                    self.cells[base + c] = 0
+        self._build_masks()
+
+    @classmethod
+    def from_cells(cls, cells, rows, cols, start, goal):
+        # Wrap an already padded occupancy buffer (as built above) without
+        # materialising a grid; large generated boards only build one if a
+        # caller actually asks for board.grid.
+        board        = cls.__new__(cls)
+        board._grid  = None
+        board.start  = start
+        board.goal   = goal
+        board.rows   = rows
+        board.cols   = cols
+        board.stride = cols + 2
+        board.step   = (-board.stride, 1, board.stride, -1)
+        board.cells  = cells
+        board._build_masks()
+        return board
+
+    def _build_masks(self):
+        # masks[i] has bit d set when the square next to cell i in direction
+        # d is open, so one read answers all four sensors. Built with one big
+        # int per direction (each byte is 0/1, shifted by at most 3 bits, so
+        # the four never overlap) rather than a Python loop over the cells.
+        size  = len(self.cells)
+        open_ = self.cells.translate(self._OPEN)
+        mask  = 0
+        for d, k in enumerate(self.step):
+            shifted = open_[k:] + bytes(k) if k > 0 else bytes(-k) + open_[:k]
+            mask |= int.from_bytes(shifted, "big") << d
+        self.masks = bytearray(mask.to_bytes(size, "big"))
+
+    @property
+    def grid(self):
+        if self._grid is None:
+            self._grid = []
+            for r in range(self.rows):
+                base = (r + 1) * self.stride + 1
+                self._grid.append([1 if v else " " for v in self.cells[base:base + self.cols]])
+        return self._grid
 
     def is_wall(self, pos):
+        # Anything off the board is wall. The padding already covers the
+        # ring one cell outside the grid; further out an index would wrap
+        # round into another row (or off the buffer), so answer that here.
+        r, c = pos
+        if not (-1 <= r <= self.rows and -1 <= c <= self.cols):
+            return 1
+        return self.cells[(r + 1) * self.stride + c + 1]
+
+    # ------------------------------------------------------------------
+    # Movement queries shared with CellBoard (d indexes N, E, S, W)
+    # ------------------------------------------------------------------
+
+    cell_based = False
+
+    def can_move(self, pos, d):
         r, c = pos
-        if r < 0 or r >= len(self.grid) or c < 0 or c >= len(self.grid[0]):
-            return True
-        return self.grid[r][c] == 1
+        return not self.cells[(r + 1) * self.stride + c + 1 + self.step[d]]
+
+    def open_mask(self, pos):
+        r, c = pos
+        return self.masks[(r + 1) * self.stride + c + 1]
+
+    def neighbours(self, pos):
+        r, c  = pos
+        i     = (r + 1) * self.stride + c + 1
+        cells = self.cells
+        if not cells[i - self.stride]:
+            yield (r - 1, c)
+        if not cells[i + 1]:
+            yield (r, c + 1)
+        if not cells[i + self.stride]:
+            yield (r + 1, c)
+        if not cells[i - 1]:
+            yield (r, c - 1)
 
     def is_goal(self, pos):
         return pos == self.goal
 
+    def fingerprint(self):
+        # Content hash of the walls only (start/goal excluded); boards are not
+        # edited after loading, so it is computed once
+        if getattr(self, "_fingerprint", None) is None:
+            h = hashlib.blake2b(digest_size=16)
+            h.update(f"grid:{self.rows}x{self.cols}:".encode())
+            h.update(self.cells)
+            self._fingerprint = h.hexdigest()
+        return self._fingerprint
+
     def printBoard(self, robot):
         print("\n" + "-" * 30)
-        for i, row in enumerate(self.grid):
-            for j, cell in enumerate(row):
-                if (i, j) == robot.curr_pos:
-                    print("*", end="")
-                elif (i, j) == self.goal:
-                    print("G", end="")
-                elif cell == 1:
-                    print("1", end="")
-                else:
-                    print(" ", end="")
-            print()
+        print("\n".join(self.render(robot.curr_pos)))
         print("-" * 30)
 
+    _CHARS = bytes.maketrans(b"\x00\x01", b" 1")
+
+    def render(self, robot_pos=None):
+        lines = []
+        for r in range(self.rows):
+            base = (r + 1) * self.stride + 1
+            line = self.cells[base:base + self.cols].translate(self._CHARS).decode()
+            for pos, ch in ((self.goal, "G"), (robot_pos, "*")):
+                if pos is not None and pos[0] == r:
+                    line = line[:pos[1]] + ch + line[pos[1] + 1:]
+            lines.append(line)
+        return lines
+
 
 class BoardLoader:
     @staticmethod
@@ -78,40 +255,63 @@ class BoardLoader:
 
 
 class RightHandDriver:
+    # Stateless: the next move depends only on where the robot is and faces
+    def state_key(self, robot):
+        return None
+
     def step(self, robot, board):
-        if robot.can_move_right(board):
+        front, left, right = robot.sense(board)
+        if right:
             robot.turn_right()
             robot.move_forward(board)
-        elif robot.can_move_forward(board):
+        elif front:
             robot.move_forward(board)
         else:
             robot.turn_left()
 
 
 class LeftHandDriver:
+    # Stateless: the next move depends only on where the robot is and faces
+    def state_key(self, robot):
+        return None
+
     def step(self, robot, board):
-        if robot.can_move_left(board):
+        front, left, right = robot.sense(board)
+        if left:
             robot.turn_left()
             robot.move_forward(board)
-        elif robot.can_move_forward(board):
+        elif front:
             robot.move_forward(board)
         else:
             robot.turn_right()
 
 
+def stream_seed(master, *labels):
+    # An independent 64-bit seed for each (master seed, labels), e.g. one per
+    # board and trial, the same whichever process draws it and in what order
+    h = hashlib.blake2b(repr((master,) + labels).encode(), digest_size=8)
+    return int.from_bytes(h.digest(), "little")
+
+
 class RandomDriver:
+    # rng: a random.Random for a reproducible run (see stream_seed); the
+    # global random module otherwise
+    def __init__(self, rng=None):
+        self.rng = rng or random
+
     def step(self, robot, board):
+        front, left, right = robot.sense(board)
         options = []
-        if robot.can_move_forward(board):
+        if front:
             options.append("F")
-        if robot.can_move_right(board):
+        if right:
             options.append("R")
-        if robot.can_move_left(board):
+        if left:
             options.append("L")
         if not options:
             robot.turn_right()
             return
-        choice = random.choice(options)
+        choice = self.rng.choice(options)
         if choice == "F":
             robot.move_forward(board)
         elif choice == "R":
@@ -125,9 +325,13 @@ class RandomDriver:
 class Result:
     STEP_TIME = 0.7   # seconds per forward move
     TURN_TIME = 1.4   # seconds per 90-degree turn
+    DIAGONAL  = 0.5 ** 0.5   # forward moves per diagonal staircase cell (r/l cost half a turn)
 
-    def __init__(self, robot):
-        self.robot = robot
+    # profile: a motion.MotionProfile to time planned paths as accelerated
+    # straights instead of a flat STEP_TIME per cell
+    def __init__(self, robot, profile=None):
+        self.robot   = robot
+        self.profile = profile
 
     def statusReport(self):
         print(f"\nFinal position : {self.robot.curr_pos}")
@@ -138,13 +342,16 @@ class Result:
     # ------------------------------------------------------------------
     # Timing estimate
     # ------------------------------------------------------------------
-    def _timeReport(self):
+    def estimate(self):
         commands = getattr(self.robot, "command_string", "")
 
+        num_diagonal = num_turns45 = 0
         if commands:
             # A* pre-computed path — exact command counts are available
-            num_steps = commands.count("F")
-            num_turns = commands.count("R") + commands.count("L")
+            num_steps    = commands.count("F")
+            num_turns    = commands.count("R") + commands.count("L")
+            num_diagonal = commands.count("D")
+            num_turns45  = commands.count("r") + commands.count("l")
             source = "A* pre-computed path"
         else:
             # Reactive drivers — approximate from logged moves/turns
@@ -152,9 +359,40 @@ class Result:
             num_turns = getattr(self.robot, "turns", 0)
             source = "reactive driver (approximate)"
 
-        step_time  = num_steps * self.STEP_TIME
-        turn_time  = num_turns * self.TURN_TIME
-        total_time = step_time + turn_time
+        if self.profile is None:
+            step_time = (num_steps + num_diagonal * self.DIAGONAL) * self.STEP_TIME
+            turn_time = (num_turns + num_turns45 / 2) * self.TURN_TIME
+            num_runs  = num_steps
+        elif commands:
+            # Whole straights accelerate and brake once each
+            prims     = compile_commands(commands)
+            step_time, turn_time = self.profile.time(prims)
+            num_runs  = sum(1 for kind, _ in prims if kind == "straight")
+        else:
+            # Reactive drivers stop in every cell
+            step_time = num_steps * self.profile.straight(1)
+            turn_time = num_turns * self.profile.turn()
+            num_runs  = num_steps
+        return {
+            "source":       source,
+            "num_steps":    num_steps,
+            "num_turns":    num_turns,
+            "num_diagonal": num_diagonal,
+            "num_turns45":  num_turns45,
+            "num_runs":     num_runs,
+            "step_time":    step_time,
+            "turn_time":    turn_time,
+            "total_time":   step_time + turn_time,
+        }
+
+    def _timeReport(self):
+        est        = self.estimate()
+        source     = est["source"]
+        num_steps  = est["num_steps"]
+        num_turns  = est["num_turns"]
+        step_time  = est["step_time"]
+        turn_time  = est["turn_time"]
+        total_time = est["total_time"]
 
         minutes = int(total_time // 60)
         seconds = total_time % 60
@@ -163,8 +401,18 @@ class Result:
         print("  ESTIMATED PHYSICAL RUN TIME")
         print(f"  Source : {source}")
         print("=" * 38)
-        print(f"  Forward moves : {num_steps:>4}  × {self.STEP_TIME}s = {step_time:>7.2f}s")
-        print(f"  Turns         : {num_turns:>4}  × {self.TURN_TIME}s = {turn_time:>7.2f}s")
+        if self.profile is None and not est["num_diagonal"]:
+            print(f"  Forward moves : {num_steps:>4}  × {self.STEP_TIME}s = {step_time:>7.2f}s")
+            print(f"  Turns         : {num_turns:>4}  × {self.TURN_TIME}s = {turn_time:>7.2f}s")
+        elif self.profile is None:
+            diag_time = est["num_diagonal"] * self.DIAGONAL * self.STEP_TIME
+            print(f"  Forward moves : {num_steps:>4}  × {self.STEP_TIME}s = {step_time - diag_time:>7.2f}s")
+            print(f"  Diagonal moves: {est['num_diagonal']:>4}  × {self.DIAGONAL * self.STEP_TIME:.2f}s"
+                  f" = {diag_time:>7.2f}s")
+            print(f"  Turns (90/45) : {num_turns:>4} / {est['num_turns45']:<3}     = {turn_time:>7.2f}s")
+        else:
+            print(f"  Forward moves : {num_steps:>4}  in {est['num_runs']:>3} runs = {step_time:>7.2f}s")
+            print(f"  Turns         : {num_turns:>4}              = {turn_time:>7.2f}s")
         print(f"  {'─' * 34}")
         if minutes > 0:
             print(f"  Total          :              {total_time:>7.2f}s  ({minutes}m {seconds:.2f}s)")
@@ -0,0 +1,149 @@
+import argparse
+import csv
+import io
+import os
+import sys
+import time
+from contextlib import contextmanager, redirect_stdout
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "hw"))
+
+import romisim
+from romisim import Simulation, SimulationEnd
+import mazegen
+from batch import load_board
+
+
+# ---------------------------------------------------------------------------
+# Firmware runner
+#
+# Runs an unmodified on-robot script (Exploration.py) on Linux: the
+# stand-in modules in hw/ provide romi, board, digitalio and
+# adafruit_debouncer on top of an emulator Board, and with the simulated
+# clock every time.sleep is free. The script is compiled once and executed
+# afresh for every board; it ends when it waits for a button press that is
+# not coming or spends its action budget.
+#
+#   python Emulator/firmware.py Exploration.py -g backtracker -s 5x5 -n 1000
+#
+# Code.py, Forward_Test.py and Turn_Test.py also import a robot module
+# that is not in this repository; they run here once it is added next to
+# them (presses=("IO0",) picks the first menu entry in Code.py).
+#
+# The firmware keeps its own fixed-size map and start pose (SIZE, row, col
+# and direction in Exploration.py), so boards must fit inside that map and
+# the simulated robot starts where the script thinks it is (--start). The
+# map size can be changed without editing the script through MAZE_SIZE in
+# the environment.
+# ---------------------------------------------------------------------------
+
+FIELDS = ["board", "end", "moves", "turns", "crashes", "sim_time", "visited",
+          "reachable", "wall_time"]
+
+
+@contextmanager
+def simulated_clock(sim):
+    saved = time.sleep, time.monotonic, time.monotonic_ns
+    time.sleep, time.monotonic, time.monotonic_ns = sim.sleep, sim.monotonic, sim.monotonic_ns
+    try:
+        yield
+    finally:
+        time.sleep, time.monotonic, time.monotonic_ns = saved
+
+
+def reachable(board, start):
+    seen, stack = {start}, [start]
+    while stack:
+        for nxt in board.neighbours(stack.pop()):
+            if nxt not in seen:
+                seen.add(nxt)
+                stack.append(nxt)
+    return seen
+
+
+def run_firmware(code, board, clock=True, **sim_args):
+    # code: a compiled script; returns the Simulation and the script's globals
+    sim = Simulation(board, **sim_args)
+    romisim.current = sim
+    scope = {"__name__": "__main__", "__file__": code.co_filename}
+    with redirect_stdout(io.StringIO()):
+        try:
+            if clock:
+                with simulated_clock(sim):
+                    exec(code, scope)
+            else:
+                exec(code, scope)
+        except SimulationEnd as e:
+            sim.end = str(e)
+        else:
+            sim.end = "finished"
+    return sim, scope
+
+
+def compile_script(path):
+    with open(path) as f:
+        return compile(f.read(), path, "exec")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run on-robot firmware against emulator boards.")
+    parser.add_argument("script", help="firmware script, e.g. Exploration.py")
+    parser.add_argument("boards", nargs="*", help="board files")
+    parser.add_argument("-g", "--generate", choices=sorted(mazegen.GENERATORS),
+                        help="run on generated mazes instead of board files")
+    parser.add_argument("-s", "--size", default="5x5",
+                        help="generated maze size in cells, ROWSxCOLS (default: 5x5)")
+    parser.add_argument("-n", "--count", type=int, default=100,
+                        help="number of generated mazes (default: 100)")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="master seed for generated mazes (default: 0)")
+    parser.add_argument("--start", default="1,1",
+                        help="starting cell ROW,COL (default: 1,1, as in Exploration.py)")
+    parser.add_argument("--heading", type=int, default=1,
+                        help="starting heading, 0 N .. 3 W (default: 1, as in Exploration.py)")
+    parser.add_argument("--real-time", action="store_true",
+                        help="let time.sleep really sleep")
+    parser.add_argument("-o", "--out", default="-",
+                        help="CSV output path (default: stdout)")
+    args = parser.parse_args(argv)
+
+    if args.generate:
+        boards = [f"{args.generate}:{args.size}:{seed}"
+                  for seed in mazegen.seeds(args.seed, args.count)]
+    else:
+        boards = args.boards
+
+    start  = tuple(int(n) for n in args.start.split(","))
+    code   = compile_script(args.script)
+    out    = sys.stdout if args.out == "-" else open(args.out, "w", newline="")
+    writer = csv.DictWriter(out, fieldnames=FIELDS)
+    writer.writeheader()
+
+    t0, full = time.perf_counter(), 0
+    for spec in boards:
+        t1    = time.perf_counter()
+        board = load_board(spec)
+        sim, _ = run_firmware(code, board, clock=not args.real_time,
+                              start=start, heading=args.heading)
+        cells = reachable(board, start)
+        full += len(sim.visited) == len(cells)
+        writer.writerow({
+            "board":     spec,
+            "end":       sim.end,
+            "moves":     sim.moves,
+            "turns":     sim.turns,
+            "crashes":   sim.crashes,
+            "sim_time":  f"{sim.now:.2f}",
+            "visited":   len(sim.visited),
+            "reachable": len(cells),
+            "wall_time": f"{time.perf_counter() - t1:.6f}",
+        })
+    if out is not sys.stdout:
+        out.close()
+    print(f"{len(boards)} runs in {time.perf_counter() - t0:.2f}s  "
+          f"(fully explored: {full})", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+from Exploration_Emulated import DIR, DELTA
+
+
+# ---------------------------------------------------------------------------
+# Modified flood fill
+#
+# FloodMap keeps the distance from every cell to the goal over what is known
+# of the maze, treating anything not yet seen as open. When a wall turns up
+# only the cells around it are re-checked, and the repair spreads only as far
+# as distances actually change, so there is no full re-flood per step. It
+# only needs a blocked(r, c, d) callback, so the same class can run on the
+# Romi against its own map.
+# ---------------------------------------------------------------------------
+
+class FloodMap:
+    def __init__(self, rows, cols, goals, blocked):
+        self.rows    = rows
+        self.cols    = cols
+        self.goals   = set(goals)
+        self.blocked = blocked
+        self.inf     = rows * cols
+        self.updates = 0                     # cells whose distance changed
+        self.dist    = [[self.inf] * cols for _ in range(rows)]
+        self._fill()
+
+    def _neighbours(self, r, c):
+        for d in range(4):
+            if not self.blocked(r, c, d):
+                dr, dc = DELTA[DIR[d]]
+                yield r + dr, c + dc
+
+    def _fill(self):
+        # Full BFS from the goal cells, used once at the start
+        frontier = []
+        for r, c in self.goals:
+            self.dist[r][c] = 0
+            frontier.append((r, c))
+        head = 0
+        while head < len(frontier):
+            r, c = frontier[head]
+            head += 1
+            for nr, nc in self._neighbours(r, c):
+                if self.dist[nr][nc] > self.dist[r][c] + 1:
+                    self.dist[nr][nc] = self.dist[r][c] + 1
+                    frontier.append((nr, nc))
+
+    def update(self, cells):
+        # Walls only ever raise distances. First collect every cell that has
+        # lost its last downhill neighbour (starting from the given cells and
+        # following the cells that were downhill of them), then rebuild just
+        # those from the untouched cells around them, nearest first.
+        dist = self.dist
+        lost = set()
+        stack = list(cells)
+        while stack:
+            cell = stack.pop()
+            r, c = cell
+            if cell in lost or cell in self.goals or dist[r][c] >= self.inf:
+                continue
+            d = dist[r][c]
+            if any(dist[nr][nc] == d - 1 and (nr, nc) not in lost
+                   for nr, nc in self._neighbours(r, c)):
+                continue
+            lost.add(cell)
+            for nr, nc in self._neighbours(r, c):
+                if dist[nr][nc] == d + 1:
+                    stack.append((nr, nc))
+
+        for r, c in lost:
+            dist[r][c] = self.inf
+        buckets = {}
+        for r, c in lost:
+            best = min([dist[nr][nc] for nr, nc in self._neighbours(r, c)], default=self.inf)
+            if best + 1 < self.inf:
+                dist[r][c] = best + 1
+                buckets.setdefault(best + 1, []).append((r, c))
+
+        while buckets:
+            d = min(buckets)
+            for r, c in buckets.pop(d):
+                if dist[r][c] != d:
+                    continue
+                for nr, nc in self._neighbours(r, c):
+                    if dist[nr][nc] > d + 1:
+                        dist[nr][nc] = d + 1
+                        buckets.setdefault(d + 1, []).append((nr, nc))
+        self.updates += len(lost)
+
+    def next_direction(self, r, c, heading):
+        # Downhill neighbour, keeping the current heading on ties
+        best_d, best = None, self.dist[r][c]
+        for d in [heading] + [d for d in range(4) if d != heading]:
+            if self.blocked(r, c, d):
+                continue
+            dr, dc = DELTA[DIR[d]]
+            if self.dist[r + dr][c + dc] < best:
+                best_d, best = d, self.dist[r + dr][c + dc]
+        return best_d
+
+
+# ---------------------------------------------------------------------------
+# Flood-fill driver (runs on ExplorationRobot)
+# ---------------------------------------------------------------------------
+
+class FloodFillDriver:
+    def __init__(self):
+        self.flood = None
+
+    def step(self, robot, board):
+        if self.flood is None:
+            rows, cols = robot.board_size
+            goals = getattr(board, "goals", None) or [robot.goal_pos]
+            self.flood = FloodMap(rows, cols, goals, robot.is_blocked)
+
+        self._sense(robot, board)
+        r, c = robot.curr_pos
+        d = self.flood.next_direction(r, c, robot.direction)
+        if d is None:
+            # Sealed off from the goal on the known map
+            return
+
+        self._turn_to(robot, d)
+        if robot.front_wall(board):
+            # Only possible for the unsensed side behind us; replan next step
+            self._sense(robot, board)
+            return
+        robot.move_forward(board)
+        robot.map.visit(*robot.curr_pos)
+
+    def _sense(self, robot, board):
+        robot.detect_walls(board)
+        self.flood.update(robot.sensed_cells())
+
+    def _turn_to(self, robot, d):
+        while robot.direction != d:
+            if (d - robot.direction) % 4 <= (robot.direction - d) % 4:
+                robot.turn_right_action()
+            else:
+                robot.turn_left_action()
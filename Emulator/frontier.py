@@ -0,0 +1,198 @@
+import argparse
+import heapq
+import io
+import itertools
+import sys
+from contextlib import redirect_stdout
+
+from emulator import Emulator, Result
+from Exploration_Emulated import DIR, DELTA, ExplorationRobot, ExplorationDriver
+import mazegen
+
+
+# ---------------------------------------------------------------------------
+# Frontier exploration
+#
+# Where the DFS in ExplorationDriver backs out of a dead end one frame at a
+# time, this driver always heads for the cheapest unseen cell: a Dijkstra
+# search over (cell, heading) on the known map, pricing a move at
+# Result.STEP_TIME and a 90-degree turn at Result.TURN_TIME, that stops at
+# the first cell the robot has not sensed from. The robot drives that route
+# and only searches again when it gets there or when a newly seen wall
+# blocks the rest of it. The run is over once no unseen cell is reachable,
+# i.e. the whole reachable maze is mapped (mapped is then True), so the
+# driver provides finished() for Emulator.run rather than stopping at the
+# goal; the run still only succeeds if the robot got to the goal on the
+# way. With return_home=True it then drives the cheapest known route back
+# to the start, as the DFS ends there too.
+#
+#   python Emulator/frontier.py                    # DFS vs frontier, boards/
+#   python Emulator/frontier.py -g backtracker -s 16x16 -n 100
+# ---------------------------------------------------------------------------
+
+class FrontierDriver:
+    def __init__(self, step_time=None, turn_time=None, return_home=False):
+        self.step_time   = Result.STEP_TIME if step_time is None else step_time
+        self.turn_time   = Result.TURN_TIME if turn_time is None else turn_time
+        self.return_home = return_home
+        self.route       = []              # headings still to drive
+        self.target      = None
+        self.mapped      = False           # no unseen cell left to reach
+        self.searches    = 0
+
+    def finished(self, robot, board):
+        return robot.explore_done
+
+    def step(self, robot, board):
+        if robot.explore_done:
+            return
+        robot.map.visit(*robot.curr_pos)
+        robot.detect_walls(board)
+
+        if not self._route_open(robot):
+            if not self.mapped:
+                self.route, self.target = self._search(robot)
+                self.searches += 1
+                self.mapped = self.target is None
+            if self.mapped:
+                if not self.return_home or robot.curr_pos == robot.start_pos:
+                    robot.explore_done = True
+                    return
+                self.route, self.target = self._search(robot, robot.start_pos)
+                self.searches += 1
+
+        d = self.route[0]
+        self._turn_to(robot, d)
+        if robot.front_wall(board):
+            # Only possible for the unsensed side behind us
+            robot.mark_wall(d)
+            self.route = []
+            return
+        robot.move_forward(board)
+        self.route.pop(0)
+
+    def _route_open(self, robot):
+        # The planned route still ends on an unseen cell (or the start, on
+        # the way home) and no wall seen since crosses it
+        if not self.route or (not self.mapped and robot.map.is_known(*self.target)):
+            return False
+        r, c = robot.curr_pos
+        for d in self.route:
+            if robot.is_blocked(r, c, d):
+                return False
+            dr, dc = DELTA[DIR[d]]
+            r, c = r + dr, c + dc
+        return True
+
+    def _search(self, robot, goal=None):
+        # Cheapest route from the robot's pose to any unseen cell (or to
+        # goal), through sensed cells only; ([headings], target) or ([], None)
+        known  = robot.map.is_known
+        start  = robot.curr_pos + (robot.direction,)
+        best   = {start: 0}
+        parent = {start: None}
+        tie    = itertools.count()
+        queue  = [(0, next(tie), start)]
+        while queue:
+            cost, _, state = heapq.heappop(queue)
+            if cost > best[state]:
+                continue
+            r, c, h = state
+            if ((r, c) == goal) if goal else not known(r, c):
+                route = []
+                while parent[state] is not None:
+                    prev = parent[state]
+                    if prev[2] == state[2]:
+                        route.append(state[2])
+                    state = prev
+                return route[::-1], (r, c)
+
+            moves = [((r, c, (h + 1) % 4), self.turn_time),
+                     ((r, c, (h - 1) % 4), self.turn_time)]
+            if not robot.is_blocked(r, c, h):
+                dr, dc = DELTA[DIR[h]]
+                moves.append(((r + dr, c + dc, h), self.step_time))
+            for nxt, step in moves:
+                if cost + step < best.get(nxt, float("inf")):
+                    best[nxt]   = cost + step
+                    parent[nxt] = state
+                    heapq.heappush(queue, (cost + step, next(tie), nxt))
+        return [], None
+
+    def _turn_to(self, robot, d):
+        while robot.direction != d:
+            if (d - robot.direction) % 4 <= (robot.direction - d) % 4:
+                robot.turn_right_action()
+            else:
+                robot.turn_left_action()
+
+
+class FullExplorationDriver(ExplorationDriver):
+    # The DFS run to the end of its exploration (back at the start) instead
+    # of stopping at the goal, for the comparison below
+    def finished(self, robot, board):
+        return robot.explore_done
+
+
+# ---------------------------------------------------------------------------
+# DFS vs frontier comparison
+#
+# Both runs map the whole reachable maze and end back at the start.
+# ---------------------------------------------------------------------------
+
+def explore(board, driver):
+    robot = ExplorationRobot(board.start, board.goal, (board.rows, board.cols),
+                             cell_based=board.cell_based)
+    # A full DFS takes about two moves and two turns per cell
+    emu = Emulator(board, robot, driver, live_run=False,
+                   max_steps=16 * board.rows * board.cols)
+    with redirect_stdout(io.StringIO()):
+        result = emu.run()
+    return result, robot
+
+
+def main(argv=None):
+    from batch import find_boards, load_board
+
+    parser = argparse.ArgumentParser(description="Compare DFS and frontier exploration.")
+    parser.add_argument("boards", nargs="*", default=["boards"],
+                        help="board files or directories (default: boards/)")
+    parser.add_argument("-g", "--generate", choices=sorted(mazegen.GENERATORS),
+                        help="run on generated mazes instead of board files")
+    parser.add_argument("-s", "--size", default="16x16",
+                        help="generated maze size in cells, ROWSxCOLS (default: 16x16)")
+    parser.add_argument("-n", "--count", type=int, default=20,
+                        help="number of generated mazes (default: 20)")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="master seed for generated mazes (default: 0)")
+    args = parser.parse_args(argv)
+
+    if args.generate:
+        boards = [f"{args.generate}:{args.size}:{seed}"
+                  for seed in mazegen.seeds(args.seed, args.count)]
+    else:
+        boards = find_boards(args.boards)
+
+    print(f"{'board':<28}{'dfs moves':>10}{'turns':>7}{'frontier moves':>16}{'turns':>7}{'mapped':>8}")
+    totals = [0, 0, 0, 0]
+    for spec in boards:
+        board = load_board(spec)
+        dfs_result, dfs = explore(board, FullExplorationDriver())
+        _, front        = explore(board, FrontierDriver(return_home=True))
+        mapped = sum(front.map.is_known(r, c) == dfs.map.is_known(r, c)
+                     for r in range(board.rows) for c in range(board.cols))
+        ok = "yes" if mapped == board.rows * board.cols else "no"
+        name = spec if len(spec) <= 27 else "..." + spec[-24:]
+        print(f"{name:<28}{dfs.steps:>10}{dfs.turns:>7}{front.steps:>16}{front.turns:>7}{ok:>8}")
+        for i, n in enumerate((dfs.steps, dfs.turns, front.steps, front.turns)):
+            totals[i] += n
+
+    dfs_time   = totals[0] * Result.STEP_TIME + totals[1] * Result.TURN_TIME
+    front_time = totals[2] * Result.STEP_TIME + totals[3] * Result.TURN_TIME
+    print(f"{'total':<28}{totals[0]:>10}{totals[1]:>7}{totals[2]:>16}{totals[3]:>7}")
+    print(f"estimated time: DFS {dfs_time:.1f}s, frontier {front_time:.1f}s"
+          f" ({front_time / dfs_time:.0%})" if dfs_time else "", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+# Stand-in for adafruit_debouncer: the simulated buttons never bounce, so
+# this only tracks edges between updates
+
+
+class Debouncer:
+    def __init__(self, io, interval=0.010):
+        self.io     = io
+        self._value = True                    # pulled up, not pressed
+        self._fell  = False
+        self._rose  = False
+
+    def update(self):
+        value       = self.io.value
+        self._fell  = self._value and not value
+        self._rose  = value and not self._value
+        self._value = value
+
+    @property
+    def value(self):
+        return self._value
+
+    @property
+    def fell(self):
+        return self._fell
+
+    @property
+    def rose(self):
+        return self._rose
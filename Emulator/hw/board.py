@@ -0,0 +1,4 @@
+# Stand-in for CircuitPython's board module: pins are just their names
+
+IO0  = "IO0"
+IO14 = "IO14"
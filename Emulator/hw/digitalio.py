@@ -0,0 +1,28 @@
+import romisim
+
+
+# Stand-in for CircuitPython's digitalio: inputs read the buttons of the
+# current romisim.Simulation
+
+class Direction:
+    INPUT  = "input"
+    OUTPUT = "output"
+
+
+class Pull:
+    UP   = "up"
+    DOWN = "down"
+
+
+class DigitalInOut:
+    def __init__(self, pin):
+        self.pin       = pin
+        self.direction = Direction.INPUT
+        self.pull      = None
+
+    @property
+    def value(self):
+        return romisim.current.level(self.pin)
+
+    def deinit(self):
+        pass
@@ -0,0 +1,40 @@
+import romisim
+
+
+# Stand-in for the Romi driver: the same calls, carried out by the current
+# romisim.Simulation instead of the motors and distance sensors
+
+class Romi:
+    def __init__(self):
+        self.sim    = romisim.current
+        self._walls = None
+
+    def _getStatus(self):
+        return {"pos": self.sim.pos, "heading": self.sim.heading, "time": self.sim.now}
+
+    def moveSquare(self):
+        self.sim.move()
+        self._walls = None
+
+    def turnLeft(self):
+        self.sim.turn(-1)
+        self._walls = None
+
+    def turnRight(self):
+        self.sim.turn(1)
+        self._walls = None
+
+    def getWalls(self):
+        self._walls = self.sim.walls()
+        return self._walls
+
+    # Readings from the last getWalls(), or a fresh one if the robot has
+    # moved since
+    def frontWall(self):
+        return (self._walls or self.getWalls())[0]
+
+    def leftWall(self):
+        return (self._walls or self.getWalls())[1]
+
+    def rightWall(self):
+        return (self._walls or self.getWalls())[2]
@@ -0,0 +1,104 @@
+# ---------------------------------------------------------------------------
+# Simulated Romi
+#
+# State shared by the stand-in romi, board, digitalio and adafruit_debouncer
+# modules in this directory. firmware.py puts this directory on sys.path,
+# sets romisim.current to a Simulation and runs an unmodified firmware
+# script against it: the Romi moves on an emulator Board, the sensors read
+# its walls and the buttons replay a scripted list of presses.
+#
+# With a simulated clock, time.sleep / time.monotonic only move
+# Simulation.now, so a run costs no wall time; moves and turns advance it
+# by the same estimates Result uses.
+# ---------------------------------------------------------------------------
+
+DELTA = ((-1, 0), (0, 1), (1, 0), (0, -1))      # N, E, S, W
+
+current = None
+
+
+class SimulationEnd(Exception):
+    # Raised into the firmware to stop it: no presses left to wait for, or
+    # the action budget is spent
+    pass
+
+
+class Simulation:
+    def __init__(self, board, start=None, heading=1, presses=("IO14",),
+                 step_time=0.7, turn_time=1.4, max_actions=100000):
+        self.board       = board
+        self.pos         = start if start is not None else board.start
+        self.heading     = heading                 # DIR index, 1 = E as in Exploration.py
+        self.presses     = list(presses)           # pins to press, in order
+        self.down        = None                    # pin currently held low
+        self.step_time   = step_time
+        self.turn_time   = turn_time
+        self.max_actions = max_actions
+        self.now         = 0.0
+        self.moves       = 0
+        self.turns       = 0
+        self.crashes     = 0
+        self.visited     = {self.pos}
+
+    # ------------------------------------------------------------------
+    # Robot
+    # ------------------------------------------------------------------
+
+    def _act(self, seconds):
+        self.now += seconds
+        if self.moves + self.turns + self.crashes >= self.max_actions:
+            raise SimulationEnd("action budget spent")
+
+    def move(self):
+        if self.board.can_move(self.pos, self.heading):
+            dr, dc   = DELTA[self.heading]
+            self.pos = (self.pos[0] + dr, self.pos[1] + dc)
+            self.visited.add(self.pos)
+            self.moves += 1
+        else:
+            # The real robot would hit the wall; here it just stays put
+            self.crashes += 1
+        self._act(self.step_time)
+
+    def turn(self, quarter):
+        self.heading = (self.heading + quarter) % 4
+        self.turns  += 1
+        self._act(self.turn_time)
+
+    def walls(self):
+        # (front, left, right), 1 for a wall
+        m = self.board.open_mask(self.pos)
+        h = self.heading
+        return (int(not m >> h & 1), int(not m >> (h - 1) % 4 & 1),
+                int(not m >> (h + 1) % 4 & 1))
+
+    # ------------------------------------------------------------------
+    # Buttons (active low, pulled up)
+    # ------------------------------------------------------------------
+
+    def level(self, pin):
+        # Called on every read of a pin: a scripted press holds the pin low
+        # for one read, and once nothing is left to press the firmware is
+        # only waiting, so the run ends
+        if self.down == pin:
+            self.down = None
+            return True
+        if self.down is None and self.presses and self.presses[0] == pin:
+            self.down = self.presses.pop(0)
+            return False
+        if self.down is None and not self.presses:
+            raise SimulationEnd("no presses left")
+        return True
+
+    # ------------------------------------------------------------------
+    # Clock
+    # ------------------------------------------------------------------
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+    def monotonic(self):
+        return self.now
+
+    def monotonic_ns(self):
+        return int(self.now * 1e9)
@@ -0,0 +1,228 @@
+import random
+from array import array
+
+from emulator import Board
+
+
+# ---------------------------------------------------------------------------
+# Seeded maze generation
+#
+# Mazes are carved straight into the padded occupancy buffer Board uses, in
+# the same doubled layout as the ASCII boards: a maze of rows × cols cells
+# becomes a (2*rows + 1) × (2*cols + 1) grid where cell (i, j) sits at grid
+# (2i + 1, 2j + 1) and the grid squares between cells are walls or passages.
+#
+#   board = generate("kruskal", 64, 64, seed=7)
+#   for board in stream("braid", 256, 256, seed=1, count=1000): ...
+# ---------------------------------------------------------------------------
+
+class _Carver:
+    def __init__(self, rows, cols):
+        self.rows   = rows
+        self.cols   = cols
+        self.grows  = 2 * rows + 1
+        self.gcols  = 2 * cols + 1
+        self.stride = self.gcols + 2
+        self.cells  = bytearray(b"\x01") * (self.stride * (self.grows + 2))
+
+        # Every cell centre is open; only the squares between them vary
+        for i in range(rows):
+            base = (2 * i + 2) * self.stride + 2
+            self.cells[base:base + 2 * cols:2] = bytes(cols)
+
+    def index(self, k):
+        i, j = divmod(k, self.cols)
+        return (2 * i + 2) * self.stride + 2 * j + 2
+
+    def carve(self, a, b):
+        self.cells[(self.index(a) + self.index(b)) // 2] = 0
+
+    def is_open(self, a, b):
+        return not self.cells[(self.index(a) + self.index(b)) // 2]
+
+    def neighbours(self, k):
+        i, j = divmod(k, self.cols)
+        if i > 0:
+            yield k - self.cols
+        if j < self.cols - 1:
+            yield k + 1
+        if i < self.rows - 1:
+            yield k + self.cols
+        if j > 0:
+            yield k - 1
+
+    def board(self, start, goal):
+        return Board.from_cells(self.cells, self.grows, self.gcols, start, goal)
+
+
+def _corners(rows, cols):
+    return (1, 1), (2 * rows - 1, 2 * cols - 1)
+
+
+# ---------------------------------------------------------------------------
+# Perfect mazes
+# ---------------------------------------------------------------------------
+
+def _backtracker(m, rng):
+    visited = bytearray(m.rows * m.cols)
+    stack   = [0]
+    visited[0] = 1
+
+    while stack:
+        k       = stack[-1]
+        options = [n for n in m.neighbours(k) if not visited[n]]
+        if not options:
+            stack.pop()
+            continue
+        n = options[rng.randrange(len(options))] if len(options) > 1 else options[0]
+        visited[n] = 1
+        m.carve(k, n)
+        stack.append(n)
+
+
+def backtracker(rows, cols, rng):
+    m = _Carver(rows, cols)
+    _backtracker(m, rng)
+    return m.board(*_corners(rows, cols))
+
+
+def _kruskal(m, rng, parent, skip=()):
+    rows, cols = m.rows, m.cols
+
+    # Edge e joins cell e >> 1 to its east (even e) or south (odd e) neighbour
+    edges = array("L", range(2 * rows * cols))
+    rng.shuffle(edges)
+
+    def find(k):
+        while parent[k] != k:
+            parent[k] = parent[parent[k]]
+            k = parent[k]
+        return k
+
+    for e in edges:
+        k = e >> 1
+        if e & 1:
+            if k + cols >= rows * cols:
+                continue
+            n = k + cols
+        else:
+            if k % cols == cols - 1:
+                continue
+            n = k + 1
+        if (k, n) in skip:
+            continue
+        a, b = find(k), find(n)
+        if a != b:
+            parent[a] = b
+            m.carve(k, n)
+
+
+def kruskal(rows, cols, rng):
+    m = _Carver(rows, cols)
+    _kruskal(m, rng, array("L", range(rows * cols)))
+    return m.board(*_corners(rows, cols))
+
+
+def prim(rows, cols, rng):
+    m        = _Carver(rows, cols)
+    in_maze  = bytearray(rows * cols)
+    frontier = []
+    queued   = bytearray(rows * cols)
+
+    def add(k):
+        in_maze[k] = 1
+        for n in m.neighbours(k):
+            if not in_maze[n] and not queued[n]:
+                queued[n] = 1
+                frontier.append(n)
+
+    add(0)
+    while frontier:
+        i = rng.randrange(len(frontier))
+        frontier[i], frontier[-1] = frontier[-1], frontier[i]
+        k = frontier.pop()
+
+        joined = [n for n in m.neighbours(k) if in_maze[n]]
+        m.carve(k, joined[rng.randrange(len(joined))])
+        add(k)
+
+    return m.board(*_corners(rows, cols))
+
+
+# ---------------------------------------------------------------------------
+# Mazes with loops
+# ---------------------------------------------------------------------------
+
+def braid(rows, cols, rng, p=0.5):
+    # Start from a perfect maze and knock through a share p of its dead ends,
+    # preferring to join two dead ends so each removal kills both.
+    m = _Carver(rows, cols)
+    _backtracker(m, rng)
+
+    def exits(k):
+        return sum(1 for n in m.neighbours(k) if m.is_open(k, n))
+
+    for k in range(rows * cols):
+        if exits(k) != 1 or rng.random() >= p:
+            continue
+        closed = [n for n in m.neighbours(k) if not m.is_open(k, n)]
+        dead   = [n for n in closed if exits(n) == 1]
+        pick   = dead or closed
+        m.carve(k, pick[rng.randrange(len(pick))])
+
+    return m.board(*_corners(rows, cols))
+
+
+def classic(rows, cols, rng):
+    # Competition layout (16×16 on a real field): start in the bottom-left
+    # corner with only its north side open, goal is the 2×2 room in the
+    # centre with a single entrance.
+    m = _Carver(rows, cols)
+
+    start  = (rows - 1) * cols
+    ci, cj = rows // 2 - 1, cols // 2 - 1
+    room   = [ci * cols + cj, ci * cols + cj + 1, (ci + 1) * cols + cj, (ci + 1) * cols + cj + 1]
+
+    parent = array("L", range(rows * cols))
+    for a, b in ((0, 1), (0, 2), (1, 3), (2, 3)):
+        m.carve(room[a], room[b])
+        parent[room[b]] = room[0]
+    parent[room[0]] = room[0]
+
+    centre = (2 * (ci + 1), 2 * (cj + 1))
+    m.cells[(centre[0] + 1) * m.stride + centre[1] + 1] = 0
+
+    _kruskal(m, rng, parent, skip={(start, start + 1)})
+    return m.board((2 * rows - 1, 1), centre)
+
+
+GENERATORS = {
+    "backtracker": backtracker,
+    "kruskal":     kruskal,
+    "prim":        prim,
+    "braid":       braid,
+    "classic":     classic,
+}
+
+
+# ---------------------------------------------------------------------------
+# Public entry points
+# ---------------------------------------------------------------------------
+
+def generate(algorithm, rows, cols, seed):
+    return GENERATORS[algorithm](rows, cols, random.Random(seed))
+
+
+def stream(algorithm, rows, cols, seed, count=None):
+    # Each maze gets its own seed drawn from the master seed, so any board of
+    # a stream can be rebuilt on its own by passing that seed to generate().
+    for maze_seed in seeds(seed, count):
+        yield generate(algorithm, rows, cols, maze_seed)
+
+
+def seeds(seed, count=None):
+    rng = random.Random(seed)
+    n   = 0
+    while count is None or n < count:
+        yield rng.getrandbits(64)
+        n += 1
@@ -0,0 +1,118 @@
+# ---------------------------------------------------------------------------
+# Knowledge map
+#
+# What a robot has learnt about the maze, one byte per cell in a single
+# preallocated bytearray:
+#
+#   bits 0-3  walls seen around the cell (1 N, 2 E, 4 S, 8 W)
+#   bit 4     visited
+#   bit 5     known: the robot has sensed from this cell
+#   bit 6     solid: the square itself is a wall (ASCII grid boards, where
+#             walls take up whole squares)
+#
+# On a cell-based maze a wall is a bit on both cells it separates; on a grid
+# board a wall seen from a cell marks the neighbouring square solid instead.
+# Nothing here allocates after construction (clear() resets in place), and
+# it only uses what CircuitPython has, so the same file runs in
+# ExplorationRobot and on the Romi (copy it next to Exploration.py).
+# A 32x32 map is 1 KB.
+# ---------------------------------------------------------------------------
+
+WALLS   = 0x0F
+VISITED = 0x10
+KNOWN   = 0x20
+SOLID   = 0x40
+
+DELTA    = ((-1, 0), (0, 1), (1, 0), (0, -1))      # N, E, S, W
+OPPOSITE = (4, 8, 1, 2)
+
+
+class MazeMap:
+    def __init__(self, rows, cols, cell_based=False):
+        self.rows       = rows
+        self.cols       = cols
+        self.cell_based = cell_based
+        self.cells      = bytearray(rows * cols)
+        self.clear()
+
+    def clear(self):
+        # Forget everything but the outer border
+        cells, rows, cols = self.cells, self.rows, self.cols
+        for i in range(len(cells)):
+            cells[i] = 0
+        if self.cell_based:
+            for r in range(rows):
+                cells[r * cols]            |= 8
+                cells[r * cols + cols - 1] |= 2
+            for c in range(cols):
+                cells[c]                     |= 1
+                cells[(rows - 1) * cols + c] |= 4
+        else:
+            for r in range(rows):
+                cells[r * cols]            = SOLID
+                cells[r * cols + cols - 1] = SOLID
+            for c in range(cols):
+                cells[c]                     = SOLID
+                cells[(rows - 1) * cols + c] = SOLID
+
+    def inside(self, r, c):
+        return 0 <= r < self.rows and 0 <= c < self.cols
+
+    # ------------------------------------------------------------------
+    # Per-cell flags
+    # ------------------------------------------------------------------
+
+    def walls(self, r, c):
+        return self.cells[r * self.cols + c] & WALLS
+
+    def visit(self, r, c):
+        self.cells[r * self.cols + c] |= VISITED
+
+    def is_visited(self, r, c):
+        return bool(self.cells[r * self.cols + c] & VISITED)
+
+    def mark_known(self, r, c):
+        self.cells[r * self.cols + c] |= KNOWN
+
+    def is_known(self, r, c):
+        return bool(self.cells[r * self.cols + c] & KNOWN)
+
+    def is_solid(self, r, c):
+        return bool(self.cells[r * self.cols + c] & SOLID)
+
+    # ------------------------------------------------------------------
+    # Walls
+    # ------------------------------------------------------------------
+
+    def set_wall(self, r, c, d):
+        # A wall seen from (r, c) in direction d (0 N, 1 E, 2 S, 3 W)
+        self.cells[r * self.cols + c] |= 1 << d
+        nr, nc = r + DELTA[d][0], c + DELTA[d][1]
+        if self.inside(nr, nc):
+            if self.cell_based:
+                self.cells[nr * self.cols + nc] |= OPPOSITE[d]
+            else:
+                self.cells[nr * self.cols + nc] |= SOLID
+
+    def is_blocked(self, r, c, d):
+        # True if the map already rules out moving from (r, c) in direction d
+        cols = self.cols
+        if self.cells[r * cols + c] >> d & 1:
+            return True
+        nr, nc = r + DELTA[d][0], c + DELTA[d][1]
+        if not (0 <= nr < self.rows and 0 <= nc < cols):
+            return True
+        return bool(self.cells[nr * cols + nc] & SOLID)
+
+    # ------------------------------------------------------------------
+    # Display
+    # ------------------------------------------------------------------
+
+    def char(self, r, c):
+        # "1" solid, "V" visited, "*" not reached yet
+        v = self.cells[r * self.cols + c]
+        if v & SOLID:
+            return "1"
+        if v & VISITED:
+            return "V"
+        return "*"
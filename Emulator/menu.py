@@ -1,28 +1,41 @@
+import argparse
+
 from emulator import *
 from Robot import *                          
 from Exploration_Emulated import ExplorationRobot, ExplorationDriver
+from render import TerminalRenderer
+from floodfill import FloodFillDriver
+from dstar import DStarLiteDriver
+from proven import ProvenExplorationDriver
+from frontier import FrontierDriver
+from profiler import Profiler
 
 
 def run_simulation(board_path, driver_class, board_name, driver_name,
-                   use_exploration_robot=False):
+                   use_exploration_robot=False, profile=False):
     print(f"\nRunning {driver_name} on {board_name}  —  {board_path}")
     print("-" * 50)
 
     board = BoardLoader.from_file(board_path)
-    rows  = len(board.grid)
-    cols  = len(board.grid[0])
 
     if use_exploration_robot:
-        robot = ExplorationRobot(board.start, board.goal, (rows, cols))
+        robot = ExplorationRobot(board.start, board.goal, (board.rows, board.cols))
     else:
-        robot = Robot(board.start, board.goal, (rows, cols))
+        robot = Robot(board.start, board.goal, (board.rows, board.cols))
 
     driver   = driver_class()
-    emu    = Emulator(board, robot, driver)
+    profiler = Profiler() if profile else None
+    emu    = Emulator(board, robot, driver, live_run=True,
+                      renderer=TerminalRenderer(delay=0.02), profiler=profiler)
     result = emu.run()
 
     print(result)
     Result(robot).statusReport()
+    if profiler is not None:
+        profiler.report()
+    if getattr(driver, "proven_length", None) is not None:
+        print(f"Shortest path proven: {driver.proven_length} moves, "
+              f"{driver.unexplored} cells left unexplored")
 
     # Show the discovered map after an exploration run
     if use_exploration_robot:
@@ -30,7 +43,7 @@ def run_simulation(board_path, driver_class, board_name, driver_name,
         robot.print_discovered_maze()
 
 
-def menu():
+def menu(profile=False):
     board_files = {
         1: {"easy1.txt":   "Easy Board 1",
             "easy2.txt":   "Easy Board 2",
@@ -48,10 +61,14 @@ def menu():
         4: RandomDriver,
         5: AStarDriver,
         6: ExplorationDriver,   # ← NEW
+        7: FloodFillDriver,
+        8: DStarLiteDriver,
+        9: ProvenExplorationDriver,
+        10: FrontierDriver,
     }
 
     # Drivers that need ExplorationRobot instead of Robot
-    exploration_drivers = {6}
+    exploration_drivers = {6, 7, 8, 9, 10}
 
     board_names = {1: "EASY", 2: "MEDIUM", 3: "HARD", 4: "ALL"}
 
@@ -62,6 +79,10 @@ def menu():
         4: "RANDOM DRIVER",
         5: "A* DRIVER",
         6: "EXPLORATION (DFS) DRIVER",   # ← NEW
+        7: "FLOOD FILL DRIVER",
+        8: "D* LITE DRIVER",
+        9: "PROVEN-PATH EXPLORATION DRIVER",
+        10: "FRONTIER EXPLORATION DRIVER",
     }
 
     while True:
@@ -120,6 +141,10 @@ def menu():
         print("  [4] RANDOM DRIVER")
         print("  [5] A* DRIVER")
         print("  [6] EXPLORATION (DFS) DRIVER")
+        print("  [7] FLOOD FILL DRIVER")
+        print("  [8] D* LITE DRIVER")
+        print("  [9] PROVEN-PATH EXPLORATION DRIVER")
+        print("  [10] FRONTIER EXPLORATION DRIVER")
         print("  [0] BACK")
 
         try:
@@ -129,7 +154,7 @@ def menu():
 
         if driver_choice == 0:
             continue
-        if driver_choice not in [1, 2, 3, 4, 5, 6]:
+        if driver_choice not in [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]:
             continue
 
         time.sleep(1)
@@ -145,6 +170,7 @@ def menu():
                         board_names.get(board_choice, "?"),
                         driver_names[driver_num],
                         use_exploration_robot=(driver_num in exploration_drivers),
+                        profile=profile,
                     )
         except Exception as e:
             print(f"\nError: {e}")
@@ -156,7 +182,11 @@ def menu():
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Interactive Micromouse Emulator.")
+    parser.add_argument("--profile", action="store_true",
+                        help="profile each run and print the report after it")
+    args = parser.parse_args()
     try:
-        menu()
+        menu(profile=args.profile)
     except KeyboardInterrupt:
         print("\nExiting.")
\ No newline at end of file
@@ -0,0 +1,224 @@
+import argparse
+import math
+import random
+import sys
+import time
+from multiprocessing import Pool
+
+from emulator import Emulator, RandomDriver, Result, stream_seed
+from Robot import Robot
+from motion import MotionProfile
+from batch import board_name, find_boards, load_board
+
+
+# ---------------------------------------------------------------------------
+# Monte Carlo RandomDriver trials
+#
+# Runs many RandomDriver trials per board across a process pool. Trial i on
+# board B draws from its own random.Random seeded with
+# stream_seed(master, batch.board_name(B), i), so every trial can be rerun
+# alone, whatever path B is given by, and the numbers do not depend on the
+# number of workers.
+#
+# Trials go out in blocks and come back in order. After each block the
+# running figures are printed to stderr:
+#   - success rate with its 95% Wilson interval
+#   - step-count quantiles of the successful trials
+#   - median time to goal and a one-line time-to-goal histogram
+# Steps and times are counted into fixed-width bins as they arrive (one step,
+# TIME_BIN seconds), so a progress line costs the number of bins, not the
+# number of trials; step quantiles are exact, time quantiles are to within
+# a bin.
+#
+# Once at least --min-trials have run and the interval's half-width is
+# within --ci, the board stops early. Where it stops depends only on the
+# seed. Checking after every block and stopping on the first narrow enough
+# interval is optional stopping: each interval on its own covers the true
+# rate 95% of the time, but the one the run stops on covers it somewhat less
+# often, so read the final interval as optimistic. Fix the trial count
+# (--ci 0) for an interval with its nominal coverage. The final report per
+# board, including a time-to-goal histogram, goes to stdout.
+#
+#   python Emulator/montecarlo.py boards/easy1.txt -n 100000 --seed 7 --ci 0.005
+#
+# vecsim.simulate is much faster for plain success rates, but its robots
+# share one NumPy stream, so its trials can't be rerun one at a time.
+# ---------------------------------------------------------------------------
+
+Z        = 1.96                                 # 95% two-sided
+TIME_BIN = 0.1                                  # seconds per time bin
+SPARK    = " .:-=+*#"                           # progress-line histogram
+
+_boards = {}
+
+
+def run_trials(task):
+    # One block of trials: [(success, steps, seconds)] in trial order
+    board_spec, seed, first, count, motion = task
+    if board_spec not in _boards:
+        _boards[board_spec] = load_board(board_spec)
+    board   = _boards[board_spec]
+    profile = MotionProfile() if motion else None
+
+    out = []
+    for i in range(first, first + count):
+        robot  = Robot(board.start, board.goal, (board.rows, board.cols))
+        driver = RandomDriver(random.Random(stream_seed(seed, board_name(board_spec), i)))
+        result = Emulator(board, robot, driver, live_run=False).run()
+        out.append((result == "SUCCESS", robot.steps,
+                    Result(robot, profile).estimate()["total_time"]))
+    return out
+
+
+class RunningHistogram:
+    # Counts per fixed-width bin, grown as larger values arrive
+    def __init__(self, width=1):
+        self.width  = width
+        self.counts = []
+        self.total  = 0
+
+    def add(self, value):
+        i = int(value / self.width + 1e-9)         # 0.3 / 0.1 is 2.999...
+        if i >= len(self.counts):
+            self.counts.extend([0] * (i + 1 - len(self.counts)))
+        self.counts[i] += 1
+        self.total     += 1
+
+    def quantile(self, p):
+        # Nearest rank; the lower edge of the bin holding it
+        if not self.total:
+            return None
+        rank = min(self.total, max(1, math.ceil(p / 100 * self.total)))
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return i * self.width
+
+    def span(self):
+        # (lowest, highest) occupied bin
+        used = [i for i, n in enumerate(self.counts) if n]
+        return used[0], used[-1]
+
+
+class TrialStats:
+    def __init__(self):
+        self.trials    = 0
+        self.successes = 0
+        self.steps     = RunningHistogram()     # of successful trials
+        self.times     = RunningHistogram(TIME_BIN)
+
+    def add(self, success, steps, seconds):
+        self.trials += 1
+        if success:
+            self.successes += 1
+            self.steps.add(steps)
+            self.times.add(seconds)
+
+    def rate(self):
+        return self.successes / self.trials if self.trials else 0.0
+
+    def interval(self):
+        # Wilson score interval for the success rate
+        n, p = self.trials, self.rate()
+        if not n:
+            return 0.0, 1.0
+        centre = (p + Z * Z / (2 * n)) / (1 + Z * Z / n)
+        half   = Z * math.sqrt(p * (1 - p) / n + Z * Z / (4 * n * n)) / (1 + Z * Z / n)
+        return max(0.0, centre - half), min(1.0, centre + half)
+
+    def half_width(self):
+        lo, hi = self.interval()
+        return (hi - lo) / 2
+
+    def histogram(self, bins=10):
+        # [(low, high, count)] over the successful trials' times, merging
+        # the fine bins into about `bins` equal groups
+        if not self.times.total:
+            return []
+        first, last = self.times.span()
+        group = -(-(last - first + 1) // bins)
+        out   = []
+        for i in range(first, last + 1, group):
+            out.append((i * TIME_BIN, (i + group) * TIME_BIN,
+                        sum(self.times.counts[i:i + group])))
+        return out
+
+    def sparkline(self, bins=10):
+        hist = self.histogram(bins)
+        top  = max((n for _, _, n in hist), default=0)
+        return "".join(SPARK[-(-n * (len(SPARK) - 1) // top)] for _, _, n in hist)
+
+    def progress(self):
+        lo, hi = self.interval()
+        q = "/".join("-" if v is None else str(v) for v in
+                     (self.steps.quantile(p) for p in (50, 90, 99)))
+        med = self.times.quantile(50)
+        return (f"n={self.trials:<7} success {self.rate():.4f} [{lo:.4f}, {hi:.4f}]  "
+                f"steps p50/p90/p99 {q}  time p50 "
+                + ("-" if med is None else f"{med:.1f}s")
+                + (f"  [{self.sparkline()}]" if self.times.total else ""))
+
+    def report(self, name, out=None):
+        lines = ["", "=" * 50, f"  {name}", "=" * 50, "  " + self.progress()]
+        hist  = self.histogram()
+        if hist:
+            top = max(n for _, _, n in hist)
+            lines.append("  time to goal (s)")
+            for a, b, n in hist:
+                bar = "#" * round(30 * n / top) if top else ""
+                lines.append(f"  {a:>8.1f} - {b:<8.1f}{n:>7}  {bar}")
+        lines.append("=" * 50)
+        print("\n".join(lines), file=out)
+
+
+def run_board(board_spec, trials, seed=0, processes=None, block=100,
+              ci=0.01, min_trials=1000, motion=False, progress=sys.stderr):
+    tasks = [(board_spec, seed, i, min(block, trials - i), motion)
+             for i in range(0, trials, block)]
+    stats = TrialStats()
+    # Leaving the with block terminates the pool, dropping queued blocks
+    with Pool(processes) as pool:
+        for results in pool.imap(run_trials, tasks):
+            for r in results:
+                stats.add(*r)
+            if progress is not None:
+                print(f"{board_spec}: {stats.progress()}", file=progress)
+            if stats.trials >= min_trials and stats.half_width() <= ci:
+                break
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Monte Carlo RandomDriver trials per board.")
+    parser.add_argument("boards", nargs="*", default=["boards"],
+                        help="board files or directories (default: boards/)")
+    parser.add_argument("-n", "--trials", type=int, default=10000,
+                        help="most trials per board (default: 10000)")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="master seed (default: 0)")
+    parser.add_argument("-j", "--processes", type=int, default=None,
+                        help="worker processes (default: one per core)")
+    parser.add_argument("--block", type=int, default=100,
+                        help="trials per task and between progress lines (default: 100)")
+    parser.add_argument("--ci", type=float, default=0.01,
+                        help="stop once the success-rate interval is within ±CI; 0 runs every "
+                             "trial (default: 0.01)")
+    parser.add_argument("--min-trials", type=int, default=1000,
+                        help="trials before stopping early (default: 1000)")
+    parser.add_argument("--motion", action="store_true",
+                        help="time trials with the trapezoidal motion profile")
+    parser.add_argument("-q", "--quiet", action="store_true",
+                        help="no progress lines")
+    args = parser.parse_args(argv)
+
+    for spec in find_boards(args.boards):
+        t0    = time.perf_counter()
+        stats = run_board(spec, args.trials, args.seed, args.processes, args.block,
+                          args.ci, args.min_trials, args.motion,
+                          progress=None if args.quiet else sys.stderr)
+        stats.report(f"{spec}  ({stats.trials} trials, {time.perf_counter() - t0:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+import math
+
+
+# ---------------------------------------------------------------------------
+# Motion primitives and a trapezoidal velocity profile
+#
+# A command string ("FFFRFFL...") is compiled into the moves the robot
+# actually makes: a straight of n cells, a 90-degree turn, or a 180-degree
+# turn where two turns the same way follow each other. Speed-run commands
+# add 45-degree turns (r, l) and diagonal runs through a staircase (D per
+# cell crossed).
+#
+# MotionProfile times a straight of n cells as one move that accelerates
+# from rest at `accel` up to `v_max`, cruises, and brakes to rest at the end
+# of the run (a triangle instead of a trapezoid if the run is too short to
+# reach v_max). Turns are on the spot and take a fixed time. The defaults
+# make a single cell take the same 0.7 s as Result.STEP_TIME, so only the
+# longer straights get cheaper.
+#
+# Diagonals are timed the same way over their true length, 1/sqrt(2) of a
+# cell per staircase cell.
+#
+# It has the same interface as Robot.CostModel (straight, diagonal, turn,
+# turn180, turn45, lower_bound, key), so the planners can use it directly:
+#   AStarDriver(planner="fastest", cost=MotionProfile())
+# ---------------------------------------------------------------------------
+
+STRAIGHT = "straight"
+DIAGONAL = "diagonal"
+TURN45   = "turn45"
+TURN90   = "turn90"
+TURN180  = "turn180"
+
+DIAGONAL_CELL = math.sqrt(0.5)          # length of one staircase cell taken diagonally
+
+
+def compile_commands(commands):
+    # "FFFRRFL" -> [("straight", 3), ("turn180", "R"), ("straight", 1), ("turn90", "L")]
+    prims = []
+    i, n  = 0, len(commands)
+    while i < n:
+        cmd = commands[i]
+        j   = i
+        while j < n and commands[j] == cmd:
+            j += 1
+        run = j - i
+        if cmd == "F":
+            prims.append((STRAIGHT, run))
+        elif cmd == "D":
+            prims.append((DIAGONAL, run))
+        elif cmd in "rl":
+            prims.extend([(TURN45, cmd)] * run)
+        elif cmd in "RL":
+            prims.extend([(TURN180, cmd)] * (run // 2))
+            if run % 2:
+                prims.append((TURN90, cmd))
+        i = j
+    return prims
+
+
+def split_time(prims, cost):
+    # (seconds moving, seconds turning) for compiled primitives under any
+    # cost model with the CostModel interface
+    moving = turning = 0.0
+    for kind, arg in prims:
+        if kind == STRAIGHT:
+            moving += cost.straight(arg)
+        elif kind == DIAGONAL:
+            moving += cost.diagonal(arg)
+        elif kind == TURN45:
+            turning += cost.turn45()
+        elif kind == TURN180:
+            turning += cost.turn180()
+        else:
+            turning += cost.turn()
+    return moving, turning
+
+
+class MotionProfile:
+    def __init__(self, cell_length=0.18, v_max=0.5, accel=1.47, turn_time=1.4,
+                 turn180_time=None, turn45_time=None):
+        self.cell_length  = cell_length          # metres
+        self.v_max        = v_max                # m/s
+        self.accel        = accel                # m/s², braking uses the same
+        self.turn_time    = turn_time            # seconds per 90-degree turn
+        self.turn180_time = 2 * turn_time if turn180_time is None else turn180_time
+        self.turn45_time  = turn_time / 2 if turn45_time is None else turn45_time
+
+    def _run(self, d):
+        ramp = self.v_max ** 2 / self.accel      # distance to reach v_max and stop again
+        if d >= ramp:
+            return d / self.v_max + self.v_max / self.accel
+        return 2 * math.sqrt(d / self.accel)
+
+    def straight(self, n):
+        return self._run(n * self.cell_length)
+
+    def diagonal(self, n):
+        return self._run(n * self.cell_length * DIAGONAL_CELL)
+
+    def turn(self):
+        return self.turn_time
+
+    def turn180(self):
+        return self.turn180_time
+
+    def turn45(self):
+        return self.turn45_time
+
+    def lower_bound(self, cells):
+        # straight() is concave, so one run is never slower than the same
+        # cells split into several
+        return self.straight(cells)
+
+    def key(self):
+        return ("trapezoid", self.cell_length, self.v_max, self.accel,
+                self.turn_time, self.turn180_time, self.turn45_time)
+
+    def time(self, prims):
+        return split_time(prims, self)
@@ -0,0 +1,157 @@
+from time import perf_counter_ns
+
+
+# ---------------------------------------------------------------------------
+# Run profiler
+#
+# Pass a Profiler to Emulator(profiler=...) to find out where a run spends
+# its time. It counts the sensor queries the driver makes on the board
+# (is_wall / can_move / open_mask / neighbours, through a counting wrapper),
+# the moves and turns, and times every step, split into phases:
+#
+#   step    one whole iteration of Emulator.run
+#   driver  driver.step, including any planning it does
+#   plan    Robot.generate_path (A* / fastest planner), a subset of driver
+#   render  renderer.draw
+#
+# Each phase goes into a fixed histogram of power-of-two nanosecond buckets,
+# so recording is one bit_length() and one list increment. With no profiler
+# the run uses the plain board and robot and none of this is touched.
+# Profilers from several runs can be merged, e.g. across batch workers.
+# ---------------------------------------------------------------------------
+
+BUCKETS = 40                                    # up to 2**40 ns, ~18 minutes
+PHASES  = ("step", "driver", "plan", "render")
+QUERIES = ("is_wall", "can_move", "open_mask", "neighbours")
+
+
+class Histogram:
+    def __init__(self):
+        self.buckets = [0] * BUCKETS            # bucket i holds [2**(i-1), 2**i) ns
+        self.count   = 0
+        self.total   = 0
+        self.max     = 0
+
+    def add(self, ns):
+        self.buckets[min(ns.bit_length(), BUCKETS - 1)] += 1
+        self.count += 1
+        self.total += ns
+        if ns > self.max:
+            self.max = ns
+
+    def merge(self, other):
+        self.buckets = [a + b for a, b in zip(self.buckets, other.buckets)]
+        self.count  += other.count
+        self.total  += other.total
+        self.max     = max(self.max, other.max)
+
+    def percentile(self, p):
+        # Upper edge of the bucket holding the p-th percentile, capped at max
+        if not self.count:
+            return 0
+        rank = p / 100 * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if n and seen >= rank:
+                return min(1 << i, self.max)
+        return self.max
+
+    def summary(self):
+        return {
+            "count":    self.count,
+            "total_ns": self.total,
+            "mean_ns":  self.total // self.count if self.count else 0,
+            "p50_ns":   self.percentile(50),
+            "p99_ns":   self.percentile(99),
+            "max_ns":   self.max,
+        }
+
+
+class CountingBoard:
+    # Stands in for the board handed to the driver; everything not counted
+    # (rows, goal, fingerprint, ...) is forwarded untouched
+    def __init__(self, board, counters):
+        self._board   = board
+        self.counters = counters
+
+    def __getattr__(self, name):
+        return getattr(self._board, name)
+
+    def is_wall(self, pos):
+        self.counters["is_wall"] += 1
+        return self._board.is_wall(pos)
+
+    def can_move(self, pos, d):
+        self.counters["can_move"] += 1
+        return self._board.can_move(pos, d)
+
+    def open_mask(self, pos):
+        self.counters["open_mask"] += 1
+        return self._board.open_mask(pos)
+
+    def neighbours(self, pos):
+        self.counters["neighbours"] += 1
+        return self._board.neighbours(pos)
+
+
+class Profiler:
+    def __init__(self):
+        self.counters = dict.fromkeys(QUERIES + ("steps", "moves", "turns", "runs"), 0)
+        self.phases   = {name: Histogram() for name in PHASES}
+
+    def add(self, phase, ns):
+        self.phases[phase].add(ns)
+
+    # ------------------------------------------------------------------
+    # Hooks used by Emulator.run
+    # ------------------------------------------------------------------
+    def attach(self, board, robot):
+        self._moves = robot.steps
+        self._turns = robot.turns
+        plan = getattr(robot, "generate_path", None)
+        if plan is not None:
+            def timed_plan(*args, **kwargs):
+                t0 = perf_counter_ns()
+                try:
+                    return plan(*args, **kwargs)
+                finally:
+                    self.add("plan", perf_counter_ns() - t0)
+            robot.generate_path = timed_plan
+        return CountingBoard(board, self.counters)
+
+    def detach(self, robot, ticks):
+        robot.__dict__.pop("generate_path", None)
+        self.counters["steps"] += ticks
+        self.counters["moves"] += robot.steps - self._moves
+        self.counters["turns"] += robot.turns - self._turns
+        self.counters["runs"]  += 1
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+    def merge(self, other):
+        for key, n in other.counters.items():
+            self.counters[key] = self.counters.get(key, 0) + n
+        for name, hist in other.phases.items():
+            self.phases[name].merge(hist)
+        return self
+
+    def summary(self):
+        return {
+            "counters": dict(self.counters),
+            "phases":   {name: h.summary() for name, h in self.phases.items() if h.count},
+        }
+
+    def report(self, out=None):
+        s = self.summary()
+        lines = ["", "=" * 38, "  PROFILE", "=" * 38]
+        for key, n in s["counters"].items():
+            lines.append(f"  {key:<11}: {n:>10}")
+        lines.append("-" * 38)
+        lines.append(f"  {'phase':<7}{'mean':>9}{'p50':>9}{'p99':>9}   (µs)")
+        for name, h in s["phases"].items():
+            lines.append(f"  {name:<7}{h['mean_ns'] / 1000:>9.1f}"
+                         f"{h['p50_ns'] / 1000:>9.1f}{h['p99_ns'] / 1000:>9.1f}")
+        lines.append("=" * 38)
+        print("\n".join(lines), file=out)
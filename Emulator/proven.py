@@ -0,0 +1,131 @@
+from Exploration_Emulated import DIR, DELTA
+
+
+# ---------------------------------------------------------------------------
+# Exploration that stops once the shortest path is proven
+#
+# Every step the driver works out two shortest start -> goal lengths over
+# what the robot has learnt:
+#
+#   optimistic   anything not seen yet is open (only known walls block)
+#   pessimistic  only moves between cells the robot has sensed from
+#
+# The optimistic length can only grow and the pessimistic one only shrink
+# as the map fills in, and once they agree no unseen cell can make the path
+# shorter, so exploring further is wasted time on the clock. Until then the
+# robot heads for the nearest unseen cell on the optimistic path.
+#
+# The run ends where the proof is made, not at the goal, so the driver
+# provides finished() for Emulator.run. It also finishes, and the run fails,
+# as soon as the known walls cut the goal off: then nothing left to explore
+# can lead there. Afterwards proven_length is the path length in moves and
+# unexplored the number of reachable cells the robot never sensed from
+# (counted on the real board, for the report only).
+# ---------------------------------------------------------------------------
+
+def shortest_path(rows, cols, start, goals, passable):
+    # BFS over moves allowed by passable(r, c, d); the cell list from start
+    # to the nearest goal, or None
+    parent = {start: None}
+    queue  = [start]
+    head   = 0
+    while head < len(queue):
+        cell = queue[head]
+        head += 1
+        if cell in goals:
+            path = []
+            while cell is not None:
+                path.append(cell)
+                cell = parent[cell]
+            return path[::-1]
+        r, c = cell
+        for d in range(4):
+            if not passable(r, c, d):
+                continue
+            dr, dc = DELTA[DIR[d]]
+            nxt = (r + dr, c + dc)
+            if nxt not in parent:
+                parent[nxt] = cell
+                queue.append(nxt)
+    return None
+
+
+def unexplored_cells(board, robot):
+    # Cells reachable from the start on the real board that the robot never
+    # sensed from
+    start = robot.start_pos
+    seen, stack = {start}, [start]
+    while stack:
+        for nxt in board.neighbours(stack.pop()):
+            if nxt not in seen:
+                seen.add(nxt)
+                stack.append(nxt)
+    return sum(not robot.map.is_known(r, c) for r, c in seen)
+
+
+class ProvenExplorationDriver:
+    def __init__(self):
+        self.goals         = None
+        self.proven        = False
+        self.sealed        = False        # no way to the goal even optimistically
+        self.proven_length = None
+        self.unexplored    = None
+
+    def finished(self, robot, board):
+        return self.proven or self.sealed
+
+    def step(self, robot, board):
+        if self.proven or self.sealed:
+            return
+        if self.goals is None:
+            self.goals = set(getattr(board, "goals", None) or [robot.goal_pos])
+            robot.map.visit(*robot.curr_pos)
+
+        robot.detect_walls(board)
+        rows, cols = robot.board_size
+        known      = robot.map.is_known
+
+        def optimistic(r, c, d):
+            return not robot.is_blocked(r, c, d)
+
+        def pessimistic(r, c, d):
+            if robot.is_blocked(r, c, d):
+                return False
+            dr, dc = DELTA[DIR[d]]
+            return known(r + dr, c + dc)
+
+        best = shortest_path(rows, cols, robot.start_pos, self.goals, optimistic)
+        if best is None:
+            self.sealed     = True
+            self.unexplored = unexplored_cells(board, robot)
+            return
+        proof = shortest_path(rows, cols, robot.start_pos, self.goals, pessimistic)
+        if proof is not None and len(proof) == len(best):
+            self.proven        = True
+            self.proven_length = len(proof) - 1
+            self.unexplored    = unexplored_cells(board, robot)
+            return
+
+        # Head for the nearest unseen cell on the optimistic path
+        targets = {cell for cell in best if not known(*cell)}
+        route   = shortest_path(rows, cols, robot.curr_pos, targets, optimistic)
+        r, c    = robot.curr_pos
+        nr, nc  = route[1]
+        for d in range(4):
+            if DELTA[DIR[d]] == (nr - r, nc - c):
+                break
+
+        self._turn_to(robot, d)
+        if robot.front_wall(board):
+            # Only possible for the unsensed side behind us; replan next step
+            robot.mark_wall(d)
+            return
+        robot.move_forward(board)
+        robot.map.visit(*robot.curr_pos)
+
+    def _turn_to(self, robot, d):
+        while robot.direction != d:
+            if (d - robot.direction) % 4 <= (robot.direction - d) % 4:
+                robot.turn_right_action()
+            else:
+                robot.turn_left_action()
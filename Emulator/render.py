@@ -0,0 +1,69 @@
+import sys
+import time
+
+
+# ---------------------------------------------------------------------------
+# Terminal renderer
+#
+# Each frame is built as a list of lines and written with a single write().
+# The first frame clears the screen; after that only the characters that
+# changed since the previous frame are redrawn, using ANSI cursor moves, so
+# a robot step usually costs one or two short escape sequences instead of a
+# full redraw and a shell spawned for "clear".
+#
+# Frames are rate-limited on their own, independent of the simulation:
+#   every  draw at most every k-th step
+#   fps    draw at most this many frames per wall-clock second
+#   delay  pause after each drawn frame, to make a run watchable
+# The last frame of a run is always drawn.
+# ---------------------------------------------------------------------------
+
+ESC = "\x1b["
+
+
+class TerminalRenderer:
+    def __init__(self, every=1, fps=None, delay=0.0, out=None):
+        self.every  = max(1, every)
+        self.fps    = fps
+        self.delay  = delay
+        self.out    = out or sys.stdout
+        self.prev   = None
+        self.frames = 0
+        self._last  = 0.0
+
+    def draw(self, board, robot, step):
+        if step % self.every:
+            return
+        now = time.perf_counter()
+        if self.fps and now - self._last < 1.0 / self.fps:
+            return
+        self._last = now
+        self._write(board.render(robot.curr_pos))
+        if self.delay:
+            time.sleep(self.delay)
+
+    def close(self, board, robot):
+        self._write(board.render(robot.curr_pos))
+        # Leave the cursor below the board for whatever prints next
+        self.out.write(f"{ESC}{len(self.prev) + 1};1H\n")
+        self.out.flush()
+
+    def _write(self, lines):
+        if self.prev is None:
+            buf = [f"{ESC}2J{ESC}H", "\n".join(lines)]
+        else:
+            buf = []
+            for r, line in enumerate(lines):
+                old = self.prev[r] if r < len(self.prev) else ""
+                if line == old:
+                    continue
+                for c, ch in enumerate(line):
+                    if c >= len(old) or old[c] != ch:
+                        buf.append(f"{ESC}{r + 1};{c + 1}H{ch}")
+                if len(old) > len(line):
+                    buf.append(f"{ESC}{r + 1};{len(line) + 1}H{ESC}K")
+        self.prev = lines
+        self.frames += 1
+        if buf:
+            self.out.write("".join(buf))
+            self.out.flush()
@@ -0,0 +1,167 @@
+import hashlib
+import importlib.util
+import json
+import os
+import sqlite3
+import sys
+import time
+from functools import lru_cache
+
+
+# ---------------------------------------------------------------------------
+# Result cache
+#
+# A deterministic driver always does the same thing on the same board, so
+# batch runs can reuse earlier results. Entries are keyed by a hash of
+#
+#   - the board's content (walls, start, goal cells)
+#   - the driver name
+#   - the driver's code version: a hash of the source of the driver's and
+#     robot's modules and the shared core (emulator, motion, mazemap,
+#     cellmaze, batch, which builds the rows, and proven, whose
+#     unexplored_cells fills every exploration row). Editing any of them
+#     makes the old entries unreachable.
+#   - the options that change a row (--motion, and --seed for the random
+#     driver, which draws from its own seeded stream)
+#
+# Only the row is stored, so batch runs that must leave something else
+# behind (a trace, a profile, a saved map) skip the cache.
+#
+# With canonical=True a board and its east-west mirror image share entries.
+# That is the one symmetry the runs respect: Robot starts facing north in
+# both, and the right-hand rule on a mirrored board makes exactly the moves
+# of the left-hand rule on the original, so the pair is stored once under
+# the smaller of the two board hashes. Rotations and the other reflections
+# change which way the robot starts facing relative to the maze, so no
+# driver's run survives them, and drivers without a mirror partner are
+# keyed on the board as it is.
+#
+# The store is one SQLite file. Workers only read it; the batch parent
+# writes new results and the hit times, and evicts the least recently used
+# rows once the cache holds more than max_entries rows or max_bytes bytes
+# of rows.
+# ---------------------------------------------------------------------------
+
+CORE_MODULES = ("emulator", "motion", "mazemap", "cellmaze", "batch", "proven")
+MIRROR       = {"right": "left", "left": "right"}
+ROW_FIELDS   = ("result", "steps", "turns", "est_time", "unexplored", "mapped")
+
+_SWAP_EW = bytes((m & 0b0101) | (m & 2) << 2 | (m & 8) >> 2 for m in range(16))
+
+
+def _module_file(name):
+    # Also finds modules not imported under their name, e.g. batch run as
+    # the __main__ script
+    module = sys.modules.get(name)
+    if module is not None:
+        return getattr(module, "__file__", None)
+    spec = importlib.util.find_spec(name)
+    return spec.origin if spec else None
+
+
+@lru_cache(maxsize=None)
+def code_version(driver_class, robot_class):
+    func  = getattr(driver_class, "func", driver_class)       # functools.partial
+    names = sorted({func.__module__, robot_class.__module__} | set(CORE_MODULES))
+    h = hashlib.blake2b(digest_size=16)
+    for name in names:
+        path = _module_file(name)
+        if path is None:
+            continue
+        h.update(name.encode())
+        with open(path, "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+def board_digest(board, mirror=False):
+    # Hash of every cell as (is_wall, open mask) plus start and goal cells;
+    # the same for an ASCII Board and a CellBoard
+    rows, cols = board.rows, board.cols
+    goals = getattr(board, "goals", None) or [board.goal]
+    flip  = (lambda p: (p[0], cols - 1 - p[1])) if mirror else (lambda p: p)
+
+    data = bytearray()
+    for r in range(rows):
+        for c in range(cols):
+            pos = flip((r, c))
+            m   = board.open_mask(pos)
+            data.append(bool(board.is_wall(pos)) << 4 | (_SWAP_EW[m] if mirror else m))
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{rows}x{cols}:{int(board.cell_based)}:".encode())
+    h.update(data)
+    h.update(repr((flip(board.start), sorted(flip(g) for g in goals))).encode())
+    return h.hexdigest()
+
+
+def cache_key(board, driver_name, version, options, canonical=False):
+    digest = board_digest(board)
+    if canonical and driver_name in MIRROR:
+        mirrored = board_digest(board, mirror=True)
+        if mirrored < digest:
+            digest, driver_name = mirrored, MIRROR[driver_name]
+    return hashlib.blake2b(repr((digest, driver_name, version, options)).encode(),
+                           digest_size=16).hexdigest()
+
+
+class ResultCache:
+    def __init__(self, path, max_entries=100_000, max_bytes=64 << 20, readonly=False):
+        self.path        = path
+        self.max_entries = max_entries
+        self.max_bytes   = max_bytes
+        self.hits        = 0
+        self.misses      = 0
+        self.evictions   = 0
+        if readonly:
+            self.db = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        else:
+            self.db = sqlite3.connect(path)
+            self.db.execute("CREATE TABLE IF NOT EXISTS results ("
+                            "key TEXT PRIMARY KEY, row TEXT, size INTEGER, used REAL)")
+            self.db.execute("CREATE INDEX IF NOT EXISTS results_used ON results(used)")
+            self.db.commit()
+
+    def get(self, key):
+        found = self.db.execute("SELECT row FROM results WHERE key = ?", (key,)).fetchone()
+        if found is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(found[0])
+
+    def put(self, key, row):
+        data = json.dumps({k: row.get(k) for k in ROW_FIELDS})
+        self.db.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+                        (key, data, len(data), time.time()))
+
+    def touch(self, key):
+        self.db.execute("UPDATE results SET used = ? WHERE key = ?", (time.time(), key))
+
+    def evict(self):
+        # Least recently used rows first, until both bounds hold
+        count, size = self.db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+        if count <= self.max_entries and size <= self.max_bytes:
+            return
+        drop = 0
+        for (n,) in self.db.execute("SELECT size FROM results ORDER BY used"):
+            if count - drop <= self.max_entries and size <= self.max_bytes:
+                break
+            drop += 1
+            size -= n
+        self.db.execute("DELETE FROM results WHERE key IN "
+                        "(SELECT key FROM results ORDER BY used LIMIT ?)", (drop,))
+        self.evictions += drop
+
+    def close(self):
+        self.db.commit()
+        self.db.close()
+
+
+# One read-only connection per worker process and cache file
+_readers = {}
+
+
+def reader(path):
+    if path not in _readers:
+        _readers[path] = ResultCache(path, readonly=True) if os.path.exists(path) else None
+    return _readers[path]
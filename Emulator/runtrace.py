@@ -0,0 +1,149 @@
+import struct
+
+from emulator import Result
+
+
+# ---------------------------------------------------------------------------
+# Binary run traces
+#
+# A trace stores every action a robot took as one byte (F, L or R, and
+# r, l, D on a diagonal speed run; moves that hit a wall are not actions),
+# plus a keyframe of the full robot
+# state every `interval` actions, so any point of a run can be rebuilt by
+# replaying at most `interval` bytes.
+#
+#   header     magic, version, board fingerprint, board size, start state,
+#              keyframe interval, counts, result, driver name
+#   keyframes  (row, col, heading, steps, turns) after 0, interval, ... actions
+#   actions    one byte per action
+#
+# Headings are stored as DIR indices (0 N, 1 E, 2 S, 3 W) whichever robot
+# class produced them. On a diagonal the keyframe heading byte also carries
+# the robot's diag_partner + 1 in bits 2-4.
+# ---------------------------------------------------------------------------
+
+MAGIC    = b"MMTR"
+VERSION  = 1
+DIR      = ["N", "E", "S", "W"]
+DELTA    = [(-1, 0), (0, 1), (1, 0), (0, -1)]
+
+_HEADER   = struct.Struct("<4sB16sIIiiBIIII")
+_KEYFRAME = struct.Struct("<iiBII")
+
+
+def _heading(robot):
+    d = robot.direction
+    h = DIR.index(d) if isinstance(d, str) else d
+    p = getattr(robot, "diag_partner", None)
+    return h if p is None else h | (p + 1) << 2
+
+
+class TraceRecorder:
+    def __init__(self, board, robot, driver, interval=256):
+        self.fingerprint = bytes.fromhex(board.fingerprint())
+        self.size        = (board.rows, board.cols)
+        self.start       = (robot.curr_pos[0], robot.curr_pos[1], _heading(robot))
+        self.driver      = type(driver).__name__
+        self.interval    = interval
+        self.actions     = bytearray()
+        self.keyframes   = [self.start + (0, 0)]
+        self.result      = ""
+        self.ticks       = 0
+
+    def record(self, action, robot):
+        # Called by the robot after every turn and every successful move
+        self.actions += action
+        if len(self.actions) % self.interval == 0:
+            r, c = robot.curr_pos
+            self.keyframes.append((r, c, _heading(robot), robot.steps, robot.turns))
+
+    def finish(self, result, ticks):
+        self.result = result
+        self.ticks  = ticks
+
+    def to_bytes(self):
+        result = self.result.encode()
+        driver = self.driver.encode()
+        out = bytearray(_HEADER.pack(MAGIC, VERSION, self.fingerprint, *self.size, *self.start,
+                                     self.interval, len(self.actions), len(self.keyframes),
+                                     self.ticks))
+        out += bytes([len(result)]) + result + bytes([len(driver)]) + driver
+        for frame in self.keyframes:
+            out += _KEYFRAME.pack(*frame)
+        out += self.actions
+        return bytes(out)
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+
+class TraceReplay:
+    def __init__(self, data):
+        (magic, version, fingerprint, rows, cols, r, c, h, self.interval,
+         n_actions, n_keyframes, self.ticks) = _HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("not a version 1 micromouse trace")
+        self.fingerprint = fingerprint.hex()
+        self.size        = (rows, cols)
+        self.start       = (r, c, h)
+
+        at = _HEADER.size
+        self.result = data[at + 1:at + 1 + data[at]].decode()
+        at += 1 + data[at]
+        self.driver = data[at + 1:at + 1 + data[at]].decode()
+        at += 1 + data[at]
+
+        self.keyframes = [_KEYFRAME.unpack_from(data, at + i * _KEYFRAME.size)
+                          for i in range(n_keyframes)]
+        at += n_keyframes * _KEYFRAME.size
+        self.actions = bytes(data[at:at + n_actions])
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls(f.read())
+
+    def __len__(self):
+        return len(self.actions)
+
+    def state(self, n):
+        # (row, col, heading, steps, turns) after the first n actions, rebuilt
+        # from the nearest keyframe at or before n
+        n = max(0, min(n, len(self.actions)))
+        k = n // self.interval
+        r, c, h, steps, turns = self.keyframes[k]
+        h, p = h & 3, (h >> 2) - 1                       # heading, diagonal partner
+        for a in self.actions[k * self.interval:n]:
+            if a == 70 or a == 68:                       # F, D
+                dr, dc = DELTA[h]
+                r, c   = r + dr, c + dc
+                steps += 1
+                if a == 68:
+                    h, p = p, h
+            elif a == 114 or a == 108:                   # r / l (45 degrees)
+                if p < 0:
+                    p = (h + 1) % 4 if a == 114 else (h - 1) % 4
+                else:
+                    h, p = p, -1
+                turns += 1
+            else:
+                h = (h + 1) % 4 if a == 82 else (h - 1) % 4   # R / L
+                turns += 1
+        return r, c, h, steps, turns
+
+    def render(self, board, n):
+        if board.fingerprint() != self.fingerprint:
+            raise ValueError("trace was recorded on a different board")
+        r, c, _, _, _ = self.state(n)
+        return board.render((r, c))
+
+    def score(self, n=None, step_time=Result.STEP_TIME, turn_time=Result.TURN_TIME):
+        # Estimated physical time up to action n (default: the whole run),
+        # priced the same way as Result for a reactive driver
+        _, _, _, steps, turns = self.state(len(self) if n is None else n)
+        return {
+            "num_steps":  steps,
+            "num_turns":  turns,
+            "total_time": steps * step_time + turns * turn_time,
+        }
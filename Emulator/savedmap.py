@@ -0,0 +1,163 @@
+import hashlib
+import struct
+
+from mazemap import MazeMap, DELTA
+
+
+# ---------------------------------------------------------------------------
+# Saved exploration maps
+#
+# Explore once, speed-run many times: what an ExplorationRobot learnt is
+# written out as its MazeMap bytes (walls, visited, known per cell) with a
+# small header, and SpeedRunDriver plans on that file instead of the true
+# board, the way the physical robot has to.
+#
+#   header  magic, version, board fingerprint, rows, cols, flags
+#           (bit 0 cell-based), start row/col, goal count
+#   goals   (row, col) per goal cell
+#   cells   one MazeMap byte per cell
+#
+# A 16x16 cell maze takes under 300 bytes.
+#
+#   python Emulator/batch.py -d frontier --maps maps/     # explore, save
+#   python Emulator/batch.py -d speedrun --maps maps/     # plan on the maps
+#
+# Each exploration driver writes maps/<board>.<driver>.mmap; --map-explorer
+# picks whose maps the speed runs load (default: frontier).
+# ---------------------------------------------------------------------------
+
+MAGIC   = b"MMMP"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sB16sHHBhhB")
+_GOAL   = struct.Struct("<hh")
+
+
+class SavedMap:
+    def __init__(self, maze_map, fingerprint, start, goals):
+        self.map         = maze_map
+        self.fingerprint = fingerprint          # hex, as Board.fingerprint()
+        self.start       = start
+        self.goals       = tuple(goals)
+
+    @classmethod
+    def from_robot(cls, robot, board):
+        m = MazeMap(robot.map.rows, robot.map.cols, robot.map.cell_based)
+        m.cells[:] = robot.map.cells
+        goals = getattr(board, "goals", None) or [robot.goal_pos]
+        return cls(m, board.fingerprint(), robot.start_pos, sorted(goals))
+
+    def to_bytes(self):
+        m   = self.map
+        out = bytearray(_HEADER.pack(MAGIC, VERSION, bytes.fromhex(self.fingerprint),
+                                     m.rows, m.cols, int(m.cell_based), *self.start,
+                                     len(self.goals)))
+        for goal in self.goals:
+            out += _GOAL.pack(*goal)
+        out += m.cells
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data):
+        (magic, version, fingerprint, rows, cols, flags, sr, sc,
+         n_goals) = _HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("not a version 1 micromouse map")
+        at    = _HEADER.size
+        goals = [_GOAL.unpack_from(data, at + i * _GOAL.size) for i in range(n_goals)]
+        at   += n_goals * _GOAL.size
+        m = MazeMap(rows, cols, bool(flags & 1))
+        m.cells[:] = data[at:at + rows * cols]
+        return cls(m, fingerprint.hex(), (sr, sc), goals)
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+    def check(self, board):
+        if self.fingerprint != board.fingerprint():
+            raise ValueError("map was explored on a different board")
+        return self
+
+
+class KnownBoard:
+    # The board interface over a saved map, open only between cells the
+    # robot sensed from, so the planners never route through unseen cells
+    def __init__(self, saved):
+        m = saved.map
+        self.map        = m
+        self.rows       = m.rows
+        self.cols       = m.cols
+        self.cell_based = m.cell_based
+        self.start      = saved.start
+        self.goals      = frozenset(saved.goals)
+        self.goal       = min(self.goals)
+        self._fingerprint = None
+
+    def is_wall(self, pos):
+        r, c = pos
+        if not self.map.inside(r, c):
+            return True
+        return not self.cell_based and not self.map.is_known(r, c)
+
+    def can_move(self, pos, d):
+        r, c = pos
+        if self.map.is_blocked(r, c, d) or not self.map.is_known(r, c):
+            return False
+        return self.map.is_known(r + DELTA[d][0], c + DELTA[d][1])
+
+    def open_mask(self, pos):
+        return sum(1 << d for d in range(4) if self.can_move(pos, d))
+
+    def neighbours(self, pos):
+        r, c = pos
+        for d in range(4):
+            if self.can_move(pos, d):
+                yield (r + DELTA[d][0], c + DELTA[d][1])
+
+    def is_goal(self, pos):
+        return pos in self.goals
+
+    def fingerprint(self):
+        # Hash of what is known, so Robot's path cache never mixes a map up
+        # with the board it was made on
+        if self._fingerprint is None:
+            h = hashlib.blake2b(digest_size=16)
+            h.update(f"known:{self.rows}x{self.cols}:".encode())
+            h.update(self.map.cells)
+            self._fingerprint = h.hexdigest()
+        return self._fingerprint
+
+
+# ---------------------------------------------------------------------------
+# Speed-run driver (runs on Robot)
+# ---------------------------------------------------------------------------
+
+class SpeedRunDriver:
+    # saved: a SavedMap; planner and cost as for AStarDriver
+    def __init__(self, saved=None, planner="shortest", cost=None):
+        self.saved   = saved
+        self.planner = planner
+        self.cost    = cost
+        self.known   = None
+
+    def state_key(self, robot):
+        return robot.command_index
+
+    def step(self, robot, board):
+        if not robot.command_string:
+            if self.known is None:
+                if self.saved is None:
+                    raise ValueError("speed run needs a saved map")
+                self.known = KnownBoard(self.saved.check(board))
+            robot.command_string = robot.generate_path(self.known, self.planner, self.cost)
+            robot.command_index  = 0
+            if not robot.command_string:
+                # No known path to the goal
+                return
+        robot.execute_next(board)
@@ -0,0 +1,124 @@
+import numpy as np
+
+from emulator import step_budget
+
+
+# ---------------------------------------------------------------------------
+# Lockstep simulation of many robots at once
+#
+# Every robot is a row in a few NumPy arrays (board, flat position in the
+# padded occupancy buffer, heading, counters) and one tick advances all of
+# them with the RightHandDriver / LeftHandDriver / RandomDriver rule. The
+# timing matches Emulator.run: the goal is checked before each driver step
+# and a robot still out after max_ticks steps (by default
+# emulator.step_budget of the boards) has failed. Wall followers also stop,
+# as failed, on the first repeated (position, heading), as Emulator.run does
+# for their state_key, so they end in exactly the same state as the scalar
+# drivers; "cycle" marks those runs. The random walk picks
+# uniformly among the same open options (F, R, L) as RandomDriver, but draws
+# from a seeded NumPy generator instead of the global random module.
+#
+#   out = simulate([board] * 1, "random", robots_per_board=100000, seed=1)
+#   out["success"].mean(), np.median(out["steps"])
+# ---------------------------------------------------------------------------
+
+DRIVERS = ("right", "left", "random")
+
+
+def simulate(boards, driver, robots_per_board=1, seed=None, max_ticks=None):
+    if driver not in DRIVERS:
+        raise ValueError(f"unknown driver {driver!r}, expected one of {DRIVERS}")
+    if any(getattr(b, "cell_based", False) for b in boards):
+        raise ValueError("lockstep simulation needs ASCII grid boards")
+    shapes = {(b.rows, b.cols) for b in boards}
+    if len(shapes) != 1:
+        raise ValueError(f"boards must all be the same size, got {sorted(shapes)}")
+
+    rows, cols = shapes.pop()
+    max_ticks  = max_ticks or step_budget(boards[0])
+    stride     = boards[0].stride
+    cells  = np.stack([np.frombuffer(bytes(b.cells), dtype=np.uint8) for b in boards])
+    offset = np.array([-stride, 1, stride, -1], dtype=np.int64)      # N, E, S, W
+
+    def flat(pos):
+        return (pos[0] + 1) * stride + pos[1] + 1
+
+    n     = len(boards) * robots_per_board
+    board = np.repeat(np.arange(len(boards)), robots_per_board)
+    pos   = np.repeat(np.array([flat(b.start) for b in boards], dtype=np.int64), robots_per_board)
+    goal  = np.repeat(np.array([flat(b.goal) for b in boards], dtype=np.int64), robots_per_board)
+    head  = np.zeros(n, dtype=np.int64)                              # Robot starts facing N
+    steps = np.zeros(n, dtype=np.int64)
+    turns = np.zeros(n, dtype=np.int64)
+    ticks = np.zeros(n, dtype=np.int64)
+    done  = np.zeros(n, dtype=bool)
+    cycle = np.zeros(n, dtype=bool)
+    rng   = np.random.default_rng(seed)
+
+    # (position, heading) states each board's wall followers have been in.
+    # Robots on the same board move identically, so one table per board.
+    seen = None
+    if driver in ("right", "left"):
+        seen = np.zeros((len(boards), cells.shape[1], 4), dtype=bool)
+
+    def is_open(idx, h):
+        return cells[board[idx], pos[idx] + offset[h]] == 0
+
+    for _ in range(max_ticks):
+        done |= pos == goal
+        idx = np.flatnonzero(~done & ~cycle)
+        if seen is not None:
+            state = (board[idx], pos[idx], head[idx])
+            again = seen[state]
+            seen[state] = True
+            cycle[idx[again]] = True
+            idx = idx[~again]
+        if idx.size == 0:
+            break
+        ticks[idx] += 1
+        h = head[idx]
+
+        if driver in ("right", "left"):
+            side  = (h + 1) % 4 if driver == "right" else (h - 1) % 4
+            other = (h - 1) % 4 if driver == "right" else (h + 1) % 4
+            side_open = is_open(idx, side)
+            fwd_open  = is_open(idx, h) & ~side_open
+            blocked   = ~side_open & ~fwd_open
+
+            new_h = np.where(side_open, side, np.where(blocked, other, h))
+            moved = side_open | fwd_open
+            turns[idx] += (side_open | blocked)
+        else:
+            opts = np.stack([is_open(idx, h), is_open(idx, (h + 1) % 4), is_open(idx, (h - 1) % 4)])
+            k    = opts.sum(axis=0)
+
+            # pick = index of the chosen option among the open ones, in the
+            # order RandomDriver lists them (F, R, L)
+            pick   = np.floor(rng.random(idx.size) * np.maximum(k, 1)).astype(np.int64)
+            rank   = np.cumsum(opts, axis=0) - 1
+            chosen = np.argmax(opts & (rank == pick), axis=0)           # 0 F, 1 R, 2 L
+
+            none   = k == 0
+            new_h  = np.where(none, (h + 1) % 4,
+                     np.where(chosen == 1, (h + 1) % 4,
+                     np.where(chosen == 2, (h - 1) % 4, h)))
+            moved  = ~none
+            turns[idx] += none | (chosen != 0) & ~none
+
+        head[idx] = new_h
+        pos[idx] += np.where(moved, offset[new_h], 0)
+        steps[idx] += moved
+
+    rows = pos // stride - 1
+    cols = pos % stride - 1
+    return {
+        "board":   board,
+        "success": done,
+        "cycle":   cycle,
+        "ticks":   ticks,
+        "steps":   steps,
+        "turns":   turns,
+        "row":     rows,
+        "col":     cols,
+        "heading": head,
+    }
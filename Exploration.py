@@ -1,8 +1,10 @@
 from romi import Romi
+import os
 import time
 import board
 import digitalio
 from adafruit_debouncer import Debouncer
+from mazemap import MazeMap
 
 pin = digitalio.DigitalInOut(board.IO14)
 pin.direction = digitalio.Direction.INPUT
@@ -27,26 +29,18 @@ DELTA = {
     "W": (0, -1)
 }
 
-SIZE = 20
-visited = [[False for _ in range(SIZE)] for _ in range(SIZE)]
+# Walls, visited and known flags in one preallocated bytearray
+# (mazemap.py, shared with the emulator); 32x32 fits in 1 KB.
+# MAZE_SIZE in settings.toml (or the environment) overrides the size.
+SIZE = int(os.getenv("MAZE_SIZE") or 20)
+maze = MazeMap(SIZE, SIZE)
 
-def create_board():
-    b = [["*" for _ in range(12)] for _ in range(12)]
-    for i in range(12):
-        b[i][11] = "1"
-        b[11][i] = "1"
-        b[i][0] = "1"
-        b[0][i] = "1"
-    return b
-
-def print_board(b):
+def print_board(m):
     print()
-    for r in b:
-        print(" ".join(r))
+    for r in range(m.rows):
+        print(" ".join(m.char(r, c) for c in range(m.cols)))
     print()
 
-maze = create_board()
-
 start_r = 1
 start_c = 1
 row = start_r
@@ -66,32 +60,14 @@ def detect_walls():
     print(f"left wall: {left}")
     print(f"right wall: {right}")
 
-    # FRONT
+    maze.mark_known(row, col)
     if front:
-        dr, dc = DELTA[DIR[direction]]
-        nr = row + dr
-        nc = col + dc
-        if 0 <= nr < 12 and 0 <= nc < 12:
-            maze[nr][nc] = "1"
-
-    # LEFT
-    left_dir = (direction - 1) % 4
+        maze.set_wall(row, col, direction)
     if left:
-        dr, dc = DELTA[DIR[left_dir]]
-        nr = row + dr
-        nc = col + dc
-        if 0 <= nr < 12 and 0 <= nc < 12:
-            print("LEFT WALL DETECTED")
-            maze[nr][nc] = "1"
-
-    # RIGHT
-    right_dir = (direction + 1) % 4
+        print("LEFT WALL DETECTED")
+        maze.set_wall(row, col, (direction - 1) % 4)
     if right:
-        dr, dc = DELTA[DIR[right_dir]]
-        nr = row + dr
-        nc = col + dc
-        if 0 <= nr < 12 and 0 <= nc < 12:
-            maze[nr][nc] = "1"
+        maze.set_wall(row, col, (direction + 1) % 4)
             
 def turn_to(new_dir):
     global direction
@@ -160,8 +136,7 @@ def move_forward():
 def explore():
     global row, col
 
-    visited[row][col] = True
-    maze[row][col] = "V"
+    maze.visit(row, col)
     print_board(maze)
 
     detect_walls()
@@ -172,11 +147,11 @@ def explore():
         new_r = row + dr
         new_c = col + dc
 
-        if maze[new_r][new_c] == "1":
+        if maze.is_blocked(row, col, new_dir):
             print(f"{DIR[new_dir]} is wall")
             continue
 
-        if visited[new_r][new_c]:
+        if maze.is_visited(new_r, new_c):
             continue
 
         STACK.append((row, col))
@@ -201,7 +176,6 @@ while True:
     if switch.fell:
         detect_walls()
         print("Beginning Exploration")
-        maze[row][col] = "X"
         print_board(maze)
         explore()
         print_board(maze)
@@ -1,19 +1,144 @@
 import time
+import random
+
+# Priority queues for A* (heapq is absent in CircuitPython)
+#
+# HeapQueue and BucketQueue keep at most one entry per cell: pushing a cell
+# that is already queued only lowers its priority, so the frontier never
+# fills up with stale duplicates. Each queue counts its pushes and pops.
+#   ListQueue    the original list: linear scan on every pop, duplicates kept
+#   HeapQueue    binary heap with a cell -> slot index, O(log n) push/pop
+#   BucketQueue  Dial's buckets, one per integer priority, O(1) push/pop;
+#                priorities must be small non-negative integers
+
+class ListQueue:
+    def __init__(self):
+        self.items  = []
+        self.pushes = 0
+        self.pops   = 0
+
+    def __len__(self):
+        return len(self.items)
+
+    def push(self, cell, priority):
+        self.pushes += 1
+        self.items.append((priority, cell))
+
+    def pop(self):
+        self.pops += 1
+        pq = self.items
+        min_idx = 0
+        for i in range(1, len(pq)):
+            if pq[i][0] < pq[min_idx][0]:
+                min_idx = i
+        item = pq[min_idx]
+        pq[min_idx] = pq[-1]
+        pq.pop()
+        return item
+
+
+class HeapQueue:
+    def __init__(self):
+        self.heap   = []          # [priority, cell]
+        self.slot   = {}          # cell -> index in heap
+        self.pushes = 0
+        self.pops   = 0
+
+    def __len__(self):
+        return len(self.heap)
+
+    def push(self, cell, priority):
+        self.pushes += 1
+        i = self.slot.get(cell)
+        if i is None:
+            i = len(self.heap)
+            self.heap.append([priority, cell])
+            self.slot[cell] = i
+        elif priority < self.heap[i][0]:
+            self.heap[i][0] = priority
+        else:
+            return
+        self._up(i)
+
+    def pop(self):
+        self.pops += 1
+        heap = self.heap
+        top  = heap[0]
+        last = heap.pop()
+        del self.slot[top[1]]
+        if heap:
+            heap[0] = last
+            self.slot[last[1]] = 0
+            self._down(0)
+        return top[0], top[1]
+
+    def _up(self, i):
+        heap, slot = self.heap, self.slot
+        item = heap[i]
+        while i > 0:
+            parent = (i - 1) >> 1
+            if heap[parent][0] <= item[0]:
+                break
+            heap[i] = heap[parent]
+            slot[heap[i][1]] = i
+            i = parent
+        heap[i] = item
+        slot[item[1]] = i
+
+    def _down(self, i):
+        heap, slot = self.heap, self.slot
+        n    = len(heap)
+        item = heap[i]
+        while True:
+            child = 2 * i + 1
+            if child >= n:
+                break
+            if child + 1 < n and heap[child + 1][0] < heap[child][0]:
+                child += 1
+            if heap[child][0] >= item[0]:
+                break
+            heap[i] = heap[child]
+            slot[heap[i][1]] = i
+            i = child
+        heap[i] = item
+        slot[item[1]] = i
+
+
+class BucketQueue:
+    def __init__(self):
+        self.buckets = []         # buckets[p] = cells queued at priority p
+        self.prio    = {}
+        self.low     = 0          # no queued cell has a lower priority
+        self.pushes  = 0
+        self.pops    = 0
+
+    def __len__(self):
+        return len(self.prio)
+
+    def push(self, cell, priority):
+        self.pushes += 1
+        old = self.prio.get(cell)
+        if old is not None:
+            if priority >= old:
+                return
+            self.buckets[old].remove(cell)
+        while len(self.buckets) <= priority:
+            self.buckets.append([])
+        self.buckets[priority].append(cell)
+        self.prio[cell] = priority
+        if priority < self.low:
+            self.low = priority
+
+    def pop(self):
+        self.pops += 1
+        while not self.buckets[self.low]:
+            self.low += 1
+        # Newest first: among equal priorities that is the cell furthest
+        # along its path, which keeps A* from fanning out across ties
+        cell = self.buckets[self.low].pop()
+        del self.prio[cell]
+        return self.low, cell
 
-# Minimal priority queue (replaces heapq, which is absent in CircuitPython)
-
-def _pq_push(pq, item):
-    pq.append(item)
-
-def _pq_pop(pq):
-    min_idx = 0
-    for i in range(1, len(pq)):
-        if pq[i][0] < pq[min_idx][0]:
-            min_idx = i
-    item = pq[min_idx]
-    pq[min_idx] = pq[-1]
-    pq.pop()
-    return item
 
 SIZE  = 12
 START = (1, 1)
@@ -64,17 +189,18 @@ def print_board(path=None):
 def heuristic(a, b):
     return abs(a[0] - b[0]) + abs(a[1] - b[1])
 
-def astar():
-    frontier = []
-    _pq_push(frontier, (0, START))
+def astar(maze=MAZE, start=START, goal=GOAL, queue=None):
+    size     = len(maze)
+    frontier = queue if queue is not None else HeapQueue()
+    frontier.push(start, 0)
 
-    came_from   = {START: None}
-    cost_so_far = {START: 0}
+    came_from   = {start: None}
+    cost_so_far = {start: 0}
 
     while frontier:
-        _, current = _pq_pop(frontier)
+        _, current = frontier.pop()
 
-        if current == GOAL:
+        if current == goal:
             path = []
             while current is not None:
                 path.append(current)
@@ -85,16 +211,56 @@ def astar():
         r, c = current
         for dr, dc in [(-1, 0), (0, 1), (1, 0), (0, -1)]:
             nr, nc = r + dr, c + dc
-            if 0 <= nr < SIZE and 0 <= nc < SIZE and MAZE[nr][nc] != 1:
+            if 0 <= nr < size and 0 <= nc < size and maze[nr][nc] != 1:
                 new_cost = cost_so_far[current] + 1
                 if (nr, nc) not in cost_so_far or new_cost < cost_so_far[(nr, nc)]:
                     cost_so_far[(nr, nc)] = new_cost
-                    priority = new_cost + heuristic((nr, nc), GOAL)
-                    _pq_push(frontier, (priority, (nr, nc)))
+                    priority = new_cost + heuristic((nr, nc), goal)
+                    frontier.push((nr, nc), priority)
                     came_from[(nr, nc)] = current
 
     return None
 
+def generate_maze(size, seed, loops=0.3):
+    # Random maze on a size x size grid (cells on odd squares), carved by a
+    # depth-first backtracker, then opened up with some extra gaps so A*
+    # has more than one route to weigh
+    random.seed(seed)
+    maze  = [[1] * size for _ in range(size)]
+    last  = size - 2 if size % 2 else size - 3     # last odd row/col inside the border
+    stack = [(1, 1)]
+    maze[1][1] = 0
+    while stack:
+        r, c = stack[-1]
+        options = []
+        for dr, dc in [(-2, 0), (0, 2), (2, 0), (0, -2)]:
+            nr, nc = r + dr, c + dc
+            if 1 <= nr <= last and 1 <= nc <= last and maze[nr][nc] == 1:
+                options.append((nr, nc))
+        if not options:
+            stack.pop()
+            continue
+        nr, nc = options[random.randrange(len(options))]
+        maze[(r + nr) // 2][(c + nc) // 2] = 0
+        maze[nr][nc] = 0
+        stack.append((nr, nc))
+    for r in range(1, last + 1):
+        for c in range(1, last + 1):
+            if maze[r][c] == 1 and (r + c) % 2 == 1 and random.random() < loops:
+                maze[r][c] = 0
+    return maze
+
+def time_astar(maze, start, goal, queue_class, repeat=1):
+    # Best of `repeat` runs, in ms, with the queue of the last run
+    best = None
+    for _ in range(repeat):
+        queue = queue_class()
+        t0    = time.monotonic_ns()
+        path  = astar(maze, start, goal, queue)
+        ms    = (time.monotonic_ns() - t0) / 1e6
+        best  = ms if best is None or ms < best else best
+    return path, best, queue
+
 def solve(commands, robot):
     actions = {
         "F": robot.move_forward,
@@ -144,11 +310,12 @@ print("=" * 42)
 print("\nMaze layout:")
 print_board()
 
-t0   = time.monotonic()
-path = astar()
-t1   = time.monotonic()
+QUEUES = [("list", ListQueue), ("heap", HeapQueue), ("bucket", BucketQueue)]
 
-elapsed_ms = (t1 - t0) * 1000
+timings = []
+for name, queue_class in QUEUES:
+    path, ms, queue = time_astar(MAZE, START, GOAL, queue_class, repeat=5)
+    timings.append((name, ms, queue))
 
 if path is None:
     print("ERROR: No path found from", START, "to", GOAL)
@@ -166,7 +333,8 @@ else:
     print(f"Cells visited: {len(path)}")
     print(f"Steps  (F)   : {num_steps}")
     print(f"Turns  (R/L) : {num_turns}")
-    print(f"A* compute   : {elapsed_ms:.3f} ms")
+    for name, ms, queue in timings:
+        print(f"A* compute   : {ms:.3f} ms  ({name}, {queue.pops} pops / {queue.pushes} pushes)")
 
     print("=" * 42)
     print("  ESTIMATED PHYSICAL RUN TIME")
@@ -177,3 +345,18 @@ else:
     print(f"  Total         :              {est_time:>6.2f}s")
     print("=" * 42)
 
+# Larger mazes, where the queue matters
+
+BIG_SIZE  = 32
+BIG_MAZES = 5
+
+print(f"\nA* on {BIG_MAZES} random {BIG_SIZE}x{BIG_SIZE} mazes (ms per solve):")
+totals = {name: 0.0 for name, _ in QUEUES}
+for seed in range(BIG_MAZES):
+    maze = generate_maze(BIG_SIZE, seed)
+    goal = (BIG_SIZE - 3, BIG_SIZE - 3)
+    for name, queue_class in QUEUES:
+        _, ms, _ = time_astar(maze, (1, 1), goal, queue_class)
+        totals[name] += ms
+for name, _ in QUEUES:
+    print(f"  {name:<7}: {totals[name] / BIG_MAZES:>8.3f} ms")
@@ -0,0 +1,16 @@
+import os
+import sys
+
+# The emulator modules import each other by bare name (run as
+# PYTHONPATH=. python Emulator/<script>.py), so put both the repo root and
+# Emulator/ on the path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (ROOT, os.path.join(ROOT, "Emulator")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+BOARDS = os.path.join(ROOT, "boards")
+
+
+def board_file(name):
+    return os.path.join(BOARDS, name)
@@ -0,0 +1,66 @@
+import io
+import os
+
+import pytest
+
+from conftest import board_file
+import batch
+
+
+def job(spec, driver, maps=None, cache=None, seed=0):
+    return (spec, driver, None, False, False, maps, cache, seed)
+
+
+# ---------------------------------------------------------------------------
+# Result / outcome contract
+# ---------------------------------------------------------------------------
+
+OUTCOMES = ("SUCCESS", "FAILED (loop)", "FAILED (cycle)", "FAILED (goal not reached)")
+
+
+@pytest.mark.parametrize("driver", sorted(set(batch.DRIVERS) - batch.MAP_DRIVERS))
+def test_rows_have_every_field(driver):
+    for name in ("easy1.txt", "easy3.txt"):
+        row = batch.run_job(job(board_file(name), driver))
+        assert set(batch.FIELDS) <= set(row)
+        assert row["result"].startswith(OUTCOMES), row["result"]
+        assert row["steps"] >= 0 and row["turns"] >= 0
+        float(row["est_time"])
+
+
+def test_unreachable_goal_never_succeeds():
+    # easy3's goal is walled off from the start
+    for driver in sorted(set(batch.DRIVERS) - batch.MAP_DRIVERS):
+        row = batch.run_job(job(board_file("easy3.txt"), driver))
+        assert row["result"] != "SUCCESS", driver
+
+
+def test_errors_become_rows():
+    row = batch.run_job(job(board_file("easy1.txt"), "speedrun"))
+    assert row["result"] == "ERROR: needs --maps"
+    row = batch.run_job(job(board_file("missing.txt"), "right"))
+    assert row["result"].startswith("ERROR")
+
+
+def test_run_batch_counts_outcomes():
+    jobs = [job(board_file(b), d) for b in ("easy1.txt", "easy3.txt") for d in ("right", "astar")]
+    out  = io.StringIO()
+    counts, _ = batch.run_batch(jobs, out, processes=2)
+    assert sum(counts.values()) == 4
+    assert counts["SUCCESS"] == 2
+    lines = out.getvalue().splitlines()
+    assert lines[0] == ",".join(batch.FIELDS) and len(lines) == 5
+
+
+def test_diagonal_cells_count_as_steps():
+    # A diagonal run crosses the same cells as the staircase it replaces
+    rows = {d: batch.run_job(job(board_file("hard1.txt"), d)) for d in ("astar", "astar-diag")}
+    assert rows["astar-diag"]["steps"] == rows["astar"]["steps"]
+    assert float(rows["astar-diag"]["est_time"]) < float(rows["astar"]["est_time"])
+
+
+def test_random_rows_ignore_how_the_board_path_is_spelt():
+    spec  = board_file("medium1.txt")
+    other = os.path.join(os.path.dirname(spec), "..", "boards", "medium1.txt")
+    a, b  = (batch.run_job(job(s, "random", seed=4)) for s in (spec, other))
+    assert (a["result"], a["steps"], a["turns"]) == (b["result"], b["steps"], b["turns"])
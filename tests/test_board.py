@@ -0,0 +1,37 @@
+import itertools
+
+import pytest
+
+from conftest import board_file
+from emulator import Board, BoardLoader
+
+
+def grid(*rows):
+    return [[1 if ch == "#" else " " for ch in row] for row in rows]
+
+
+def test_short_rows_and_border_are_wall():
+    board = Board(grid("   ", " "), (0, 0), (0, 2))
+    assert (board.rows, board.cols) == (2, 3)
+    assert not board.is_wall((1, 0))
+    assert board.is_wall((1, 1)) and board.is_wall((1, 2))
+    for pos in [(-1, 0), (0, -1), (2, 1), (1, 3), (-1, -1), (2, 3)]:
+        assert board.is_wall(pos)
+
+
+@pytest.mark.parametrize("pos", [(0, 5), (0, 40), (-7, 1), (1, -4), (100, 100), (-100, -100)])
+def test_is_wall_far_off_board(pos):
+    # Without the guard (0, 5) would wrap round onto the open row below
+    board = Board(grid("   ", "   "), (0, 0), (1, 2))
+    assert board.is_wall(pos)
+
+
+def test_masks_match_is_wall():
+    board = BoardLoader.from_file(board_file("hard1.txt"))
+    steps = [(-1, 0), (0, 1), (1, 0), (0, -1)]
+    for r, c in itertools.product(range(board.rows), range(board.cols)):
+        expect = sum(1 << d for d, (dr, dc) in enumerate(steps)
+                     if not board.is_wall((r + dr, c + dc)))
+        assert board.open_mask((r, c)) == expect
+        assert sorted(board.neighbours((r, c))) == sorted(
+            (r + dr, c + dc) for d, (dr, dc) in enumerate(steps) if expect >> d & 1)
@@ -0,0 +1,56 @@
+import itertools
+
+from cellmaze import CellBoardLoader
+
+
+def reachable(board, start):
+    seen, stack = {start}, [start]
+    while stack:
+        for nxt in board.neighbours(stack.pop()):
+            if nxt not in seen:
+                seen.add(nxt)
+                stack.append(nxt)
+    return seen
+
+
+TEXT = """\
+o---o---o---o
+| S     |   |
+o   o---o   o
+|       | G |
+o---o---o---o
+"""
+
+
+def test_cell_board_from_text(tmp_path):
+    path = tmp_path / "tiny.txt"
+    path.write_text(TEXT)
+    board = CellBoardLoader.from_file(str(path))
+    assert (board.rows, board.cols) == (2, 3)
+    assert board.start == (0, 0)
+    assert board.goal == (1, 2) and board.goals == {(1, 2)}
+    assert board.cell_based
+    assert sorted(board.neighbours((0, 0))) == [(0, 1), (1, 0)]
+    assert sorted(board.neighbours((1, 2))) == [(0, 2)]
+    # The goal's column is walled off from the start's
+    assert reachable(board, board.start) == {(0, 0), (0, 1), (1, 0), (1, 1)}
+
+
+def test_cell_board_from_maz_and_num_agree(tmp_path):
+    # One 2x2 maze, walls as N=1 E=2 S=4 W=8: open between every cell
+    # except (0, 0) and (0, 1)
+    cells = {(0, 0): 0b1011, (0, 1): 0b0011, (1, 0): 0b1101, (1, 1): 0b0110}
+    size  = 2
+    data  = bytearray(size * size)
+    lines = []
+    for (x, y), walls in cells.items():
+        data[x * size + y] = walls
+        lines.append(f"{x} {y} {walls & 1} {walls >> 1 & 1} {walls >> 2 & 1} {walls >> 3 & 1}")
+    (tmp_path / "m.maz").write_bytes(bytes(data))
+    (tmp_path / "m.num").write_text("\n".join(lines) + "\n")
+
+    maz = CellBoardLoader.from_file(str(tmp_path / "m.maz"))
+    num = CellBoardLoader.from_file(str(tmp_path / "m.num"))
+    for pos in itertools.product(range(2), range(2)):
+        assert maz.open_mask(pos) == num.open_mask(pos)
+    assert maz.fingerprint() == num.fingerprint()
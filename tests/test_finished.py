@@ -0,0 +1,66 @@
+import io
+from contextlib import redirect_stdout
+
+from conftest import board_file
+from emulator import Board, BoardLoader, Emulator
+from Robot import Robot
+from Exploration_Emulated import ExplorationRobot
+from proven import ProvenExplorationDriver
+
+
+# ---------------------------------------------------------------------------
+# Emulator.run with a driver's finished() hook: the driver ends the run,
+# but it only succeeds if the robot has been on the goal
+# ---------------------------------------------------------------------------
+
+class StopAt:
+    # Calls the run over once `after` steps have been taken; never moves
+    def __init__(self, after=0):
+        self.after = after
+        self.steps = 0
+
+    def finished(self, robot, board):
+        return self.steps >= self.after
+
+    def step(self, robot, board):
+        self.steps += 1
+
+
+def corridor(start, goal):
+    return Board([[" "] * 4], start, goal)
+
+
+def test_finished_before_goal_fails():
+    board = corridor((0, 0), (0, 3))
+    robot = Robot(board.start, board.goal, (board.rows, board.cols))
+    assert Emulator(board, robot, StopAt()).run() == "FAILED (goal not reached)"
+
+
+def test_finished_on_goal_succeeds():
+    board = corridor((0, 2), (0, 2))
+    robot = Robot(board.start, board.goal, (board.rows, board.cols))
+    assert Emulator(board, robot, StopAt(3)).run() == "SUCCESS"
+
+
+def explore(name, driver):
+    board = BoardLoader.from_file(board_file(name))
+    robot = ExplorationRobot(board.start, board.goal, (board.rows, board.cols))
+    with redirect_stdout(io.StringIO()):
+        result = Emulator(board, robot, driver).run()
+    return result, robot
+
+
+def test_proven_stops_with_the_path_known():
+    driver = ProvenExplorationDriver()
+    result, robot = explore("hard1.txt", driver)
+    assert result == "SUCCESS"
+    assert driver.proven and driver.proven_length > 0
+
+
+def test_proven_on_sealed_goal_fails_fast():
+    driver = ProvenExplorationDriver()
+    result, robot = explore("easy3.txt", driver)
+    assert result == "FAILED (goal not reached)"
+    assert driver.sealed and not driver.proven
+    # Stops once the known walls cut the goal off, not at the step budget
+    assert robot.steps < 50
@@ -0,0 +1,54 @@
+import io
+from contextlib import redirect_stdout
+
+from conftest import board_file
+from emulator import BoardLoader, Emulator
+from Exploration_Emulated import ExplorationRobot
+from frontier import FrontierDriver, FullExplorationDriver
+import batch
+
+
+def explore(name, driver):
+    board = BoardLoader.from_file(board_file(name))
+    robot = ExplorationRobot(board.start, board.goal, (board.rows, board.cols))
+    with redirect_stdout(io.StringIO()):
+        result = Emulator(board, robot, driver).run()
+    return result, robot
+
+
+def test_frontier_maps_everything_and_reaches_goal():
+    driver = FrontierDriver()
+    result, robot = explore("hard1.txt", driver)
+    assert result == "SUCCESS"
+    assert driver.mapped
+
+
+def test_frontier_on_sealed_goal_fails():
+    # easy3's goal is walled off: mapping everything is not a success
+    driver = FrontierDriver()
+    result, robot = explore("easy3.txt", driver)
+    assert result == "FAILED (goal not reached)"
+    assert driver.mapped
+
+
+def test_frontier_return_home_ends_at_start():
+    driver = FrontierDriver(return_home=True)
+    result, robot = explore("medium2.txt", driver)
+    assert result == "SUCCESS"
+    assert robot.curr_pos == robot.start_pos
+
+
+def test_comparison_runs_both_end_at_start():
+    # The DFS-vs-frontier table counts a return leg for both explorers
+    for name in ("hard1.txt", "medium1.txt"):
+        for driver in (FullExplorationDriver(), FrontierDriver(return_home=True)):
+            _, robot = explore(name, driver)
+            assert robot.curr_pos == robot.start_pos
+
+
+def test_mapped_only_for_exploration_drivers():
+    rows = {d: batch.run_job((board_file("easy3.txt"), d, None, False, False, None, None, 0))
+            for d in ("frontier", "right")}
+    assert rows["frontier"]["unexplored"] == 0 and rows["frontier"]["mapped"] == "yes"
+    assert rows["frontier"]["result"] == "FAILED (goal not reached)"
+    assert rows["right"]["unexplored"] is None and rows["right"]["mapped"] is None
@@ -0,0 +1,39 @@
+import pytest
+
+from emulator import Board
+import mazegen
+
+
+def reachable(board, start):
+    seen, stack = {start}, [start]
+    while stack:
+        for nxt in board.neighbours(stack.pop()):
+            if nxt not in seen:
+                seen.add(nxt)
+                stack.append(nxt)
+    return seen
+
+
+@pytest.mark.parametrize("algorithm", sorted(mazegen.GENERATORS))
+def test_generated_mazes_are_connected(algorithm):
+    rows, cols = 8, 11
+    for seed in mazegen.seeds(1, 5):
+        board = mazegen.generate(algorithm, rows, cols, seed)
+        cells = {(2 * i + 1, 2 * j + 1) for i in range(rows) for j in range(cols)}
+        seen  = reachable(board, board.start)
+        assert cells <= seen
+        assert board.goal in seen
+
+
+def test_generation_is_seeded():
+    a = mazegen.generate("braid", 9, 9, 42)
+    b = mazegen.generate("braid", 9, 9, 42)
+    assert a.cells == b.cells and (a.start, a.goal) == (b.start, b.goal)
+    assert list(mazegen.seeds(5, 3)) == list(mazegen.seeds(5, 3))
+
+
+def test_from_cells_matches_grid():
+    maze  = mazegen.generate("kruskal", 5, 7, 3)
+    board = Board(maze.grid, maze.start, maze.goal)
+    assert board.cells == maze.cells
+    assert board.masks == maze.masks
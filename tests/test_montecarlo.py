@@ -0,0 +1,50 @@
+import os
+
+from conftest import board_file
+import montecarlo
+
+
+def summary(stats):
+    return (stats.trials, stats.successes, stats.steps.counts, stats.times.counts)
+
+
+def test_same_figures_for_any_worker_count():
+    spec = board_file("medium2.txt")
+    runs = [montecarlo.run_board(spec, 400, seed=5, processes=j, block=50, ci=0, progress=None)
+            for j in (1, 3)]
+    assert summary(runs[0]) == summary(runs[1])
+    assert runs[0].trials == 400
+
+
+def test_early_stop_depends_only_on_seed():
+    spec = board_file("easy1.txt")
+    runs = [montecarlo.run_board(spec, 5000, seed=1, processes=j, block=100, ci=0.02,
+                                 min_trials=200, progress=None)
+            for j in (1, 2)]
+    assert runs[0].trials < 5000
+    assert summary(runs[0]) == summary(runs[1])
+
+
+def test_running_histogram_quantiles_are_exact_for_steps():
+    hist   = montecarlo.RunningHistogram()
+    values = [5, 1, 9, 3, 3, 7, 2, 8, 4, 6]
+    for v in values:
+        hist.add(v)
+    ranked = sorted(values)
+    for p, rank in ((10, 1), (50, 5), (90, 9), (100, 10)):
+        assert hist.quantile(p) == ranked[rank - 1]
+
+
+def test_time_bins():
+    hist = montecarlo.RunningHistogram(montecarlo.TIME_BIN)
+    for t in (0.3, 0.7, 1.05):
+        hist.add(t)
+    assert hist.counts[3] == hist.counts[7] == hist.counts[10] == 1
+    assert hist.span() == (3, 10)
+
+
+def test_streams_ignore_how_the_board_path_is_spelt():
+    spec  = board_file("easy1.txt")
+    other = os.path.join(os.path.dirname(spec), ".", "easy1.txt")
+    assert montecarlo.run_trials((spec, 3, 0, 20, False)) == \
+        montecarlo.run_trials((other, 3, 0, 20, False))
@@ -0,0 +1,37 @@
+import pytest
+
+from emulator import Result
+from Robot import CostModel, fastest_path
+from motion import MotionProfile, compile_commands, split_time
+import mazegen
+
+
+COSTS = [CostModel(), MotionProfile(), MotionProfile(v_max=2.0, accel=4.0)]
+
+
+def test_one_cell_matches_result():
+    assert MotionProfile().straight(1) == pytest.approx(Result.STEP_TIME, abs=0.01)
+
+
+@pytest.mark.parametrize("cost", COSTS)
+def test_lower_bound_never_beats_split_runs(cost):
+    for n in range(1, 40):
+        bound = cost.lower_bound(n)
+        assert bound <= cost.straight(n) + 1e-9
+        for a in range(1, n):
+            assert bound <= cost.straight(a) + cost.straight(n - a) + 1e-9
+
+
+@pytest.mark.parametrize("cost", COSTS)
+def test_lower_bound_admissible_on_mazes(cost):
+    # The A* heuristic: never more than the best route actually costs
+    for seed in mazegen.seeds(2, 5):
+        board = mazegen.generate("braid", 8, 8, seed)
+        commands = fastest_path(board, board.start, 0, board.goal, cost)
+        manhattan = abs(board.start[0] - board.goal[0]) + abs(board.start[1] - board.goal[1])
+        assert cost.lower_bound(manhattan) <= sum(split_time(compile_commands(commands), cost)) + 1e-9
+
+
+def test_compile_commands():
+    assert compile_commands("FFFRRFL") == [("straight", 3), ("turn180", "R"),
+                                           ("straight", 1), ("turn90", "L")]
@@ -0,0 +1,108 @@
+import io
+import os
+
+import pytest
+
+from conftest import board_file
+from emulator import Board, Emulator, RandomDriver, RightHandDriver, LeftHandDriver
+from Robot import Robot
+from Exploration_Emulated import ExplorationRobot
+from floodfill import FloodFillDriver
+import batch
+import mazegen
+import resultcache
+
+
+def job(spec, driver, maps=None, cache=None, seed=0):
+    return (spec, driver, None, False, False, maps, cache, seed)
+
+
+def run(jobs, store):
+    counts, _ = batch.run_batch(jobs, io.StringIO(), processes=1, cache=store)
+    return counts
+
+
+def test_code_version_covers_the_row_builders(monkeypatch):
+    hashed = []
+    monkeypatch.setattr(resultcache, "_module_file", lambda name: hashed.append(name))
+    resultcache.code_version.__wrapped__(FloodFillDriver, ExplorationRobot)
+    assert {"floodfill", "Exploration_Emulated", "batch", "proven"} <= set(hashed)
+
+
+def test_maps_are_written_with_the_cache_on(tmp_path):
+    db   = str(tmp_path / "results.db")
+    spec = board_file("hard1.txt")
+    for i in range(2):
+        maps  = str(tmp_path / f"maps{i}")
+        os.makedirs(maps)
+        store = resultcache.ResultCache(db)
+        run([job(spec, "frontier", (maps, "frontier"), (db, False)),
+             job(spec, "astar", (maps, "frontier"), (db, False))], store)
+        store.close()
+        assert os.listdir(maps) == ["hard1.txt.frontier.mmap"]
+    # The exploration ran both times; astar came from the cache the second
+    assert (store.hits, store.misses) == (1, 0)
+
+
+def test_cache_hits_repeat_rows(tmp_path):
+    db    = str(tmp_path / "results.db")
+    jobs  = [job(board_file(b), d, cache=(db, False), seed=7)
+             for b in ("easy1.txt", "medium1.txt") for d in ("right", "random", "floodfill")]
+    store = resultcache.ResultCache(db)
+    first = [batch.run_job(j) for j in jobs]
+    for row in first:
+        store.put(row["cache_key"], row)
+    store.close()
+    resultcache._readers.clear()
+
+    again = [batch.run_job(j) for j in jobs]
+    for a, b in zip(first, again):
+        assert b.get("cached")
+        assert {k: a[k] for k in resultcache.ROW_FIELDS} == {k: b[k] for k in resultcache.ROW_FIELDS}
+
+
+def test_random_cache_key_depends_on_seed():
+    board   = mazegen.generate("kruskal", 6, 6, 1)
+    version = resultcache.code_version(RandomDriver, Robot)
+    keys    = {resultcache.cache_key(board, "random", version, (False, seed)) for seed in range(3)}
+    assert len(keys) == 3
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    store = resultcache.ResultCache(str(tmp_path / "r.db"), max_entries=2)
+    for key in "abc":
+        store.put(key, {"result": key})
+    store.touch("a")
+    store.evict()
+    assert store.evictions == 1
+    assert store.get("b") is None and store.get("a") and store.get("c")
+
+
+# ---------------------------------------------------------------------------
+# Mirror images
+# ---------------------------------------------------------------------------
+
+def mirror(board):
+    flip = lambda p: (p[0], board.cols - 1 - p[1])
+    return Board([row[::-1] for row in board.grid], flip(board.start), flip(board.goal))
+
+
+def simulate(board, driver):
+    robot = Robot(board.start, board.goal, (board.rows, board.cols))
+    return Emulator(board, robot, driver).run(), robot.steps, robot.turns
+
+
+@pytest.mark.parametrize("seed", list(mazegen.seeds(3, 10)))
+def test_mirror_shares_cache_entries(seed):
+    board   = mazegen.generate("braid", 7, 7, seed)
+    flipped = mirror(board)
+    key     = lambda b, d, canonical: resultcache.cache_key(b, d, "v", (False,), canonical)
+
+    assert resultcache.board_digest(board, mirror=True) == resultcache.board_digest(flipped)
+    assert key(board, "right", True) == key(flipped, "left", True)
+    assert key(board, "right", False) != key(flipped, "left", False)
+    # Only right/left have a mirror partner
+    assert key(board, "astar", True) == key(board, "astar", False)
+
+    # and the rows really are the same
+    assert simulate(board, RightHandDriver()) == simulate(flipped, LeftHandDriver())
@@ -0,0 +1,31 @@
+from conftest import board_file
+from emulator import BoardLoader
+from savedmap import SavedMap
+import batch
+
+
+def job(spec, driver, maps):
+    return (spec, driver, None, False, False, maps, None, 0)
+
+
+def test_round_trip(tmp_path):
+    spec = board_file("hard1.txt")
+    assert batch.run_job(job(spec, "frontier", (str(tmp_path), "frontier")))["result"] == "SUCCESS"
+    path  = batch.map_path(str(tmp_path), spec, "frontier")
+    saved = SavedMap.load(path)
+    assert SavedMap.from_bytes(saved.to_bytes()).to_bytes() == saved.to_bytes()
+    saved.check(BoardLoader.from_file(spec))
+
+
+def test_maps_are_named_per_explorer(tmp_path):
+    spec = board_file("hard2.txt")
+    maps = str(tmp_path)
+    for explorer in ("frontier", "proven"):
+        assert batch.run_job(job(spec, explorer, (maps, explorer)))["result"] == "SUCCESS"
+    frontier = SavedMap.load(batch.map_path(maps, spec, "frontier"))
+    proven   = SavedMap.load(batch.map_path(maps, spec, "proven"))
+    assert frontier.to_bytes() != proven.to_bytes()
+
+    for explorer in ("frontier", "proven"):
+        row = batch.run_job(job(spec, "speedrun", (maps, explorer)))
+        assert row["result"] == "SUCCESS"
@@ -0,0 +1,36 @@
+import pytest
+
+from emulator import Emulator, RightHandDriver, LeftHandDriver
+from Robot import Robot
+import mazegen
+import vecsim
+
+
+SCALAR = {"right": RightHandDriver, "left": LeftHandDriver}
+
+
+@pytest.mark.parametrize("driver", sorted(SCALAR))
+def test_wall_followers_match_emulator(driver):
+    # braid mazes end both ways; wall followers never reach the
+    # centre goal of the classic ones
+    boards = [mazegen.generate(algorithm, 10, 10, seed)
+              for algorithm in ("braid", "classic") for seed in mazegen.seeds(4, 15)]
+    out    = vecsim.simulate(boards, driver)
+    cycles = successes = 0
+    for i, board in enumerate(boards):
+        robot  = Robot(board.start, board.goal, (board.rows, board.cols))
+        result = Emulator(board, robot, SCALAR[driver]()).run()
+        assert out["success"][i] == (result == "SUCCESS")
+        assert out["cycle"][i] == result.startswith("FAILED (cycle)")
+        assert (out["steps"][i], out["turns"][i]) == (robot.steps, robot.turns)
+        assert (out["row"][i], out["col"][i]) == robot.curr_pos
+        assert "NESW"[out["heading"][i]] == robot.direction
+        cycles    += result.startswith("FAILED (cycle)")
+        successes += result == "SUCCESS"
+    assert cycles and successes
+
+
+def test_identical_robots_on_one_board():
+    board = mazegen.generate("braid", 8, 8, 11)
+    out   = vecsim.simulate([board], "right", robots_per_board=5)
+    assert len(set(out["steps"])) == 1 and len(set(out["cycle"])) == 1